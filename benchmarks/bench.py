@@ -0,0 +1,259 @@
+"""Benchmarks for pytacite against a local DataCite stand-in server.
+
+Measures the throughput of get, count, record lookups, paginate and
+iter_records, the peak memory of paging, and the overhead per record compared
+to plain requests and json. Paging is measured with the configured JSON
+decoder (the fastest installed one by default) and with the json module. The
+server runs in a separate process, so it isn't included in the timings and
+memory measurements.
+
+Usage:
+
+    python benchmarks/bench.py --records 10000 --per-page 1000
+    python benchmarks/bench.py --latency 0.05 --compress --json results.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import requests
+
+import pytacite
+from pytacite import DOIs
+from pytacite.decode import accept_encoding
+from pytacite.decode import get_decoder
+
+
+def start_server(n_records, latency, record_size, compress):
+    """Start the stand-in server in a subprocess and return it and its URL."""
+
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            str(Path(__file__).parent / "server.py"),
+            "--records",
+            str(n_records),
+            "--latency",
+            str(latency),
+            "--record-size",
+            str(record_size),
+        ]
+        + (["--compress"] if compress else []),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+    return proc, proc.stdout.readline().strip()
+
+
+def _consume(pages):
+
+    n = 0
+    for page in pages:
+        for _ in page:
+            n = n + 1
+
+    return n
+
+
+_session = requests.Session()
+
+
+def _baseline(per_page):
+    """Cursor paging with requests and json only."""
+
+    link = f"{pytacite.config.api_url}/dois?page[size]={per_page}&page[cursor]=*"
+    n = 0
+
+    while link:
+        res_json = json.loads(_session.get(link).content)
+        n = n + len(res_json["data"])
+        link = res_json["links"].get("next")
+
+    return n
+
+
+def benchmarks(args):
+    """Benchmarks as (name, function) pairs. Functions return (ops, records)."""
+
+    per_page = args.per_page
+
+    def get():
+        for _ in range(args.calls):
+            DOIs().get(per_page=25)
+        return args.calls, args.calls * 25
+
+    def count():
+        for _ in range(args.calls):
+            DOIs().count()
+        return args.calls, 0
+
+    def getitem():
+        for i in range(args.calls):
+            DOIs()[f"10.1234/bench-{i}"]
+        return args.calls, args.calls
+
+    def paginate(json_decoder=None, **kwargs):
+        def run():
+            decoder = pytacite.config.json_decoder
+            if json_decoder is not None:
+                pytacite.config.json_decoder = json_decoder
+
+            try:
+                pager = DOIs().paginate(per_page=per_page, n_max=None, **kwargs)
+                n = _consume(pager)
+            finally:
+                pytacite.config.json_decoder = decoder
+
+            return pager.pages, n
+
+        return run
+
+    def iter_records():
+        n = sum(1 for _ in DOIs().iter_records(per_page=per_page))
+        return -(-n // per_page), n
+
+    def baseline():
+        n = _baseline(per_page)
+        return -(-n // per_page), n
+
+    return [
+        ("get", get),
+        ("count", count),
+        ("getitem", getitem),
+        ("baseline (requests + json)", baseline),
+        ("paginate", paginate()),
+        ("paginate (json decoder)", paginate(json_decoder="json")),
+        ("paginate (prefetch=2)", paginate(prefetch=2)),
+        ("paginate (stream)", paginate(stream=True)),
+        ("iter_records", iter_records),
+    ]
+
+
+def measure(func, repeat):
+    """Best time of repeat runs and peak memory of one traced run."""
+
+    seconds = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops, records = func()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": seconds,
+        "ops": ops,
+        "records": records,
+        "ops_per_second": ops / seconds,
+        "records_per_second": records / seconds,
+        "peak_memory_mb": peak / 1024**2,
+    }
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--record-size", type=int, default=1000, help="bytes")
+    parser.add_argument("--compress", action="store_true", help="gzip responses")
+    parser.add_argument("--per-page", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=100, help="for get and count")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    proc, url = start_server(
+        args.records, args.latency, args.record_size, args.compress
+    )
+    pytacite.config.api_url = url
+
+    results = {}
+
+    try:
+        for name, func in benchmarks(args):
+            results[name] = measure(func, args.repeat)
+    finally:
+        pytacite.close_session()
+        proc.terminate()
+        proc.wait()
+
+    # overhead of pytacite per record compared to requests and json
+    baseline = results["baseline (requests + json)"]
+    for name in [
+        "paginate",
+        "paginate (json decoder)",
+        "paginate (prefetch=2)",
+        "paginate (stream)",
+    ]:
+        results[name]["overhead_us_per_record"] = (
+            1e6
+            * (results[name]["seconds"] - baseline["seconds"])
+            / results[name]["records"]
+        )
+    results["iter_records"]["overhead_us_per_record"] = (
+        1e6
+        * (results["iter_records"]["seconds"] - baseline["seconds"])
+        / results["iter_records"]["records"]
+    )
+
+    decoder = get_decoder(pytacite.config.json_decoder)
+    decoder_name = getattr(decoder, "__module__", None) or repr(decoder)
+
+    print(
+        f"pytacite {pytacite.__version__}, Python {platform.python_version()}, "
+        f"{args.records} records of {args.record_size} bytes, "
+        f"{args.per_page} per page, latency {args.latency} s"
+    )
+    print(
+        f"JSON decoder: {decoder_name}, Accept-Encoding: {accept_encoding}, "
+        f"compressed responses: {args.compress}"
+    )
+    speedup = (
+        results["paginate (json decoder)"]["seconds"] / results["paginate"]["seconds"]
+    )
+    print(f"Paging speedup of the JSON decoder over json: {speedup:.2f}x")
+    print()
+    print(
+        f"{'benchmark':<28}{'seconds':>10}{'ops/s':>10}{'records/s':>12}"
+        f"{'peak MB':>10}{'us/record':>11}"
+    )
+    for name, r in results.items():
+        overhead = r.get("overhead_us_per_record")
+        print(
+            f"{name:<28}{r['seconds']:>10.3f}{r['ops_per_second']:>10.1f}"
+            f"{r['records_per_second']:>12.0f}{r['peak_memory_mb']:>10.2f}"
+            + (f"{overhead:>11.1f}" if overhead is not None else f"{'':>11}")
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "pytacite": pytacite.__version__,
+                    "python": platform.python_version(),
+                    "json_decoder": decoder_name,
+                    "accept_encoding": accept_encoding,
+                    "args": vars(args),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
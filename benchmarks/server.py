@@ -0,0 +1,199 @@
+"""Local stand-in for the DataCite REST API.
+
+Serves synthetic DOI records as JSON:API pages with cursor and number paging,
+facets in the meta, and single record lookups. Records are encoded once at
+startup, so the server adds little overhead to the measurements. With
+--compress, responses are gzip compressed for clients that accept it.
+
+Usage:
+
+    python benchmarks/server.py --records 10000 --latency 0.05
+
+The base URL of the server is printed on the first line of the output.
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qsl
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+
+
+def make_record(i, record_size=1000):
+    """Synthetic DOI record of roughly record_size bytes."""
+
+    ent = {
+        "id": f"10.1234/bench-{i}",
+        "type": "dois",
+        "attributes": {
+            "doi": f"10.1234/bench-{i}",
+            "prefix": "10.1234",
+            "suffix": f"bench-{i}",
+            "titles": [{"title": f"Benchmark record {i}"}],
+            "creators": [{"name": f"Creator {i}", "nameType": "Personal"}],
+            "publisher": "pytacite",
+            "publicationYear": 2000 + i % 25,
+            "types": {"resourceTypeGeneral": ["Dataset", "Text", "Software"][i % 3]},
+            "state": "findable",
+            "created": "2020-01-01T00:00:00.000Z",
+            "updated": "2020-01-01T00:00:00.000Z",
+            "descriptions": [],
+        },
+        "relationships": {
+            "client": {"data": {"id": "bench.client", "type": "clients"}},
+            "provider": {"data": {"id": "bench", "type": "providers"}},
+        },
+    }
+
+    padding = record_size - len(json.dumps(ent))
+    if padding > 0:
+        ent["attributes"]["descriptions"] = [{"description": "x" * padding}]
+
+    return ent
+
+
+def _meta(total, size, page, facets):
+
+    meta = {
+        "total": total,
+        "totalPages": -(-total // size),
+        "page": page,
+    }
+
+    if facets:
+        meta["states"] = [{"id": "findable", "title": "Findable", "count": total}]
+        meta["resourceTypes"] = [
+            {"id": t.lower(), "title": t, "count": total // 3}
+            for t in ["Dataset", "Text", "Software"]
+        ]
+        meta["published"] = [
+            {"id": str(y), "title": str(y), "count": total // 25}
+            for y in range(2024, 1999, -1)
+        ]
+
+    return meta
+
+
+def make_handler(n_records, latency=0.0, record_size=1000, compress=False):
+    """Request handler class serving n_records synthetic records."""
+
+    records = [
+        json.dumps(make_record(i, record_size)).encode() for i in range(n_records)
+    ]
+    index = {f"10.1234/bench-{i}": i for i in range(n_records)}
+
+    class DataCiteHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+
+            if latency:
+                time.sleep(latency)
+
+            url = urlsplit(self.path)
+            params = dict(parse_qsl(url.query))
+            collection, _, record_id = url.path.strip("/").partition("/")
+
+            if collection != "dois":
+                return self.send_json(b'{"errors":[{"status":"404"}]}', 404)
+
+            if record_id:
+                i = index.get(record_id.lower())
+                if i is None:
+                    return self.send_json(b'{"errors":[{"status":"404"}]}', 404)
+                return self.send_json(b'{"data":' + records[i] + b"}")
+
+            self.send_page(url.path, params)
+
+        def send_page(self, path, params):
+
+            size = int(params.get("page[size]", 25))
+            facets = params.get("disable-facets") != "true"
+            links = {}
+
+            if "page[cursor]" in params:
+                cursor = params["page[cursor]"]
+                start = 0 if cursor in ("*", "1") else int(cursor)
+
+                if start + size < n_records:
+                    params["page[cursor]"] = str(start + size)
+                    links["next"] = (
+                        f"http://{self.headers['Host']}{path}?{urlencode(params)}"
+                    )
+            else:
+                start = (int(params.get("page[number]", 1)) - 1) * size
+
+            meta = _meta(n_records, size, start // size + 1, facets)
+
+            self.send_json(
+                b'{"data":['
+                + b",".join(records[start : start + size])
+                + b'],"meta":'
+                + json.dumps(meta).encode()
+                + b',"links":'
+                + json.dumps(links).encode()
+                + b"}"
+            )
+
+        def send_json(self, body, status=200):
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/vnd.api+json")
+
+            if compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body, compresslevel=1)
+                self.send_header("Content-Encoding", "gzip")
+
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return DataCiteHandler
+
+
+def make_server(n_records=10000, latency=0.0, record_size=1000, compress=False, port=0):
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", port), make_handler(n_records, latency, record_size, compress)
+    )
+    server.daemon_threads = True
+
+    return server
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--record-size", type=int, default=1000, help="bytes")
+    parser.add_argument("--compress", action="store_true", help="gzip responses")
+    parser.add_argument("--port", type=int, default=0)
+    args = parser.parse_args()
+
+    server = make_server(
+        args.records, args.latency, args.record_size, args.compress, args.port
+    )
+    print(f"http://127.0.0.1:{server.server_address[1]}", flush=True)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,13 @@ except ImportError:
 
 
 from pytacite.api import DOI
+from pytacite.api import AsyncClientPrefixes
+from pytacite.api import AsyncClients
+from pytacite.api import AsyncDOIs
+from pytacite.api import AsyncEvents
+from pytacite.api import AsyncPrefixes
+from pytacite.api import AsyncProviderPrefixes
+from pytacite.api import AsyncProviders
 from pytacite.api import Client
 from pytacite.api import ClientPrefix
 from pytacite.api import ClientPrefixes
@@ -23,8 +30,22 @@ from pytacite.api import Providers
 
 # from pytacite.api import Report
 # from pytacite.api import Reports
+from pytacite.base import Facet
 from pytacite.base import QueryError
+from pytacite.base import close_async_session
+from pytacite.base import close_session
 from pytacite.base import config
+from pytacite.base import count_many
+from pytacite.cache import ResponseCache
+from pytacite.graph import CitationGraph
+from pytacite.graph import GraphBuilder
+from pytacite.harvest import Harvester
+from pytacite.metrics import RequestEvent
+from pytacite.metrics import Stats
+from pytacite.mirror import Mirror
+from pytacite.retry import RateLimiter
+from pytacite.sample import Sample
+from pytacite.sync import IncrementalSync
 
 __all__ = [
     "DOI",
@@ -43,6 +64,27 @@ __all__ = [
     "ProviderPrefixes",
     # "Report",
     # "Reports",
+    "AsyncDOIs",
+    "AsyncClients",
+    "AsyncClientPrefixes",
+    "AsyncEvents",
+    "AsyncPrefixes",
+    "AsyncProviders",
+    "AsyncProviderPrefixes",
+    "CitationGraph",
+    "GraphBuilder",
+    "Harvester",
+    "IncrementalSync",
+    "Mirror",
+    "RequestEvent",
+    "Stats",
+    "Facet",
     "QueryError",
+    "RateLimiter",
+    "ResponseCache",
+    "Sample",
+    "close_async_session",
+    "close_session",
     "config",
+    "count_many",
 ]
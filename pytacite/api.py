@@ -1,5 +1,18 @@
+from urllib.parse import quote_plus
+
+from pytacite.base import AsyncBaseDataCite
 from pytacite.base import BaseDataCite
 from pytacite.base import _pipe_method
+from pytacite.sample import async_sample
+from pytacite.sample import sample
+
+
+def _quote_term(value):
+    """Phrase term of the query syntax, with quotes and backslashes escaped."""
+
+    value = value.replace("\\", "\\\\").replace('"', '\\"')
+
+    return f'"{value}"'
 
 
 class DOI(dict):
@@ -11,12 +24,36 @@ class DOI(dict):
 class DOIs(BaseDataCite):
     resource_class = DOI
 
+    columns = {
+        "id": "id",
+        "title": "attributes.titles.0.title",
+        "creators": "attributes.creators.*.name",
+        "publisher": "attributes.publisher",
+        "publicationYear": "attributes.publicationYear",
+        "resourceTypeGeneral": "attributes.types.resourceTypeGeneral",
+        "state": "attributes.state",
+        "created": "attributes.created",
+        "updated": "attributes.updated",
+        "client_id": "relationships.client.data.id",
+    }
+    categorical = ["resourceTypeGeneral", "state", "client_id"]
+
     @_pipe_method
     def filter(self, **kwargs):
 
         for argument, value in kwargs.items():
             self._add_params(argument, value)
 
+    @_pipe_method
+    def select(self, *fields):
+
+        self._add_params(self._fields_param(), list(fields))
+
+    @_pipe_method
+    def include(self, *relationships):
+
+        self._add_params("include", list(relationships))
+
     @_pipe_method
     def query(self, *args, **kwargs):
 
@@ -41,6 +78,34 @@ class DOIs(BaseDataCite):
 
         self._add_params("random", True)
 
+    def sample(self, n, seed=None, per_page=1000, max_workers=4, exclude=None):
+        """Random sample of n unique DOIs of the query.
+
+        See pytacite.sample.sample.
+
+        Example:
+
+            s = DOIs().filter(prefix="10.5438").sample(5000, seed=42)
+            s.params
+        """
+
+        return sample(self, n, seed, per_page, max_workers, exclude)
+
+    def _batch_query(self, ids):
+
+        dois = " OR ".join(_quote_term(i.upper()) for i in ids)
+
+        # quoted, as DOIs can contain "#", "&" and "+"
+        query = self.__class__(params={"query": quote_plus(f"doi:({dois})")})
+
+        # keep the selected fields
+        if self.params and self._fields_param() in self.params:
+            query = query.select(*self.params[self._fields_param()])
+
+        query.stats = self.stats
+
+        return query
+
 
 class Client(dict):
     pass
@@ -55,6 +120,16 @@ class Clients(BaseDataCite):
         for argument, value in kwargs.items():
             self._add_params(argument, value)
 
+    @_pipe_method
+    def select(self, *fields):
+
+        self._add_params(self._fields_param(), list(fields))
+
+    @_pipe_method
+    def include(self, *relationships):
+
+        self._add_params("include", list(relationships))
+
     @_pipe_method
     def query(self, *args, **kwargs):
 
@@ -91,6 +166,16 @@ class ClientPrefixes(BaseDataCite):
         for argument, value in kwargs.items():
             self._add_params(argument, value)
 
+    @_pipe_method
+    def select(self, *fields):
+
+        self._add_params(self._fields_param(), list(fields))
+
+    @_pipe_method
+    def include(self, *relationships):
+
+        self._add_params("include", list(relationships))
+
     @_pipe_method
     def query(self, *args, **kwargs):
 
@@ -118,12 +203,33 @@ class Event(dict):
 class Events(BaseDataCite):
     resource_class = Event
 
+    columns = {
+        "id": "id",
+        "subj-id": "attributes.subj-id",
+        "obj-id": "attributes.obj-id",
+        "relation-type-id": "attributes.relation-type-id",
+        "source-id": "attributes.source-id",
+        "occurred-at": "attributes.occurred-at",
+        "total": "attributes.total",
+    }
+    categorical = ["relation-type-id", "source-id"]
+
     @_pipe_method
     def filter(self, **kwargs):
 
         for argument, value in kwargs.items():
             self._add_params(argument, value)
 
+    @_pipe_method
+    def select(self, *fields):
+
+        self._add_params(self._fields_param(), list(fields))
+
+    @_pipe_method
+    def include(self, *relationships):
+
+        self._add_params("include", list(relationships))
+
     @_pipe_method
     def query(self, *args, **kwargs):
 
@@ -157,6 +263,16 @@ class Prefixes(BaseDataCite):
         for argument, value in kwargs.items():
             self._add_params(argument, value)
 
+    @_pipe_method
+    def select(self, *fields):
+
+        self._add_params(self._fields_param(), list(fields))
+
+    @_pipe_method
+    def include(self, *relationships):
+
+        self._add_params("include", list(relationships))
+
 
 class Provider(dict):
     pass
@@ -171,6 +287,16 @@ class Providers(BaseDataCite):
         for argument, value in kwargs.items():
             self._add_params(argument, value)
 
+    @_pipe_method
+    def select(self, *fields):
+
+        self._add_params(self._fields_param(), list(fields))
+
+    @_pipe_method
+    def include(self, *relationships):
+
+        self._add_params("include", list(relationships))
+
     @_pipe_method
     def query(self, *args, **kwargs):
 
@@ -207,6 +333,16 @@ class ProviderPrefixes(BaseDataCite):
         for argument, value in kwargs.items():
             self._add_params(argument, value)
 
+    @_pipe_method
+    def select(self, *fields):
+
+        self._add_params(self._fields_param(), list(fields))
+
+    @_pipe_method
+    def include(self, *relationships):
+
+        self._add_params("include", list(relationships))
+
     @_pipe_method
     def query(self, *args, **kwargs):
 
@@ -225,3 +361,33 @@ class ProviderPrefixes(BaseDataCite):
             by = f"-{by}"
 
         self._add_params("sort", by)
+
+
+class AsyncDOIs(DOIs, AsyncBaseDataCite):
+    async def sample(self, n, seed=None, per_page=1000, max_workers=4, exclude=None):
+
+        return await async_sample(self, n, seed, per_page, max_workers, exclude)
+
+
+class AsyncClients(Clients, AsyncBaseDataCite):
+    pass
+
+
+class AsyncClientPrefixes(ClientPrefixes, AsyncBaseDataCite):
+    pass
+
+
+class AsyncEvents(Events, AsyncBaseDataCite):
+    pass
+
+
+class AsyncPrefixes(Prefixes, AsyncBaseDataCite):
+    pass
+
+
+class AsyncProviders(Providers, AsyncBaseDataCite):
+    pass
+
+
+class AsyncProviderPrefixes(ProviderPrefixes, AsyncBaseDataCite):
+    pass
@@ -1,8 +1,49 @@
+import asyncio
+import copy
 import functools
+import hashlib
+import json
 import logging
+import os
+import queue
+import threading
+import time
+import weakref
+from collections import deque
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from urllib.parse import parse_qsl
+from urllib.parse import quote
 from urllib.parse import quote_plus
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+from urllib.parse import urlunsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from pytacite.decode import accept_encoding
+from pytacite.decode import get_decoder
+from pytacite.export import to_arrow
+from pytacite.export import to_pandas
+from pytacite.export import write_arrow_ipc
+from pytacite.export import write_jsonl
+from pytacite.export import write_parquet
+from pytacite.metrics import RequestEvent
+from pytacite.metrics import Stats
+from pytacite.metrics import _Counted
+from pytacite.metrics import _n_records
+from pytacite.retry import backoff
+from pytacite.retry import retry_after
+from pytacite.stream import StreamedPage
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 try:
     from pytacite._version import __version__
@@ -18,14 +59,258 @@ class Config(dict):
         return super().__setitem__(key, value)
 
 
-config = Config(email=None, api_url="https://api.datacite.org")
+config = Config(
+    email=None,
+    api_url="https://api.datacite.org",
+    pool_connections=10,
+    pool_maxsize=10,
+    keep_alive=True,
+    timeout=None,
+    headers=None,
+    cache=None,
+    max_retries=3,
+    retry_backoff_factor=0.5,
+    retry_backoff_max=60,
+    retry_http_codes=[429, 500, 502, 503, 504],
+    rate_limiter=None,
+    hooks=[],
+    json_decoder="auto",
+    coalesce_requests=True,
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _create_session():
+
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections, pool_maxsize=config.pool_maxsize
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    session.headers["User-Agent"] = "pytacite/" + __version__
+    if not config.keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def get_session():
+    """Return the shared HTTP session, creating it on first use.
+
+    The session keeps connections alive and pools them per host, so
+    consecutive requests (e.g. pages of a Paginator) reuse the same TCP+TLS
+    connection. It is shared by all collections and threads. Pool settings
+    are read from ``config`` when the session is created.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+
+def close_session():
+    """Close the shared HTTP session and release its connections.
+
+    A new session is created on the next request, picking up changes to
+    the pool settings in ``config``.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+_async_sessions = weakref.WeakKeyDictionary()
+
+
+def _require_httpx():
+
+    if httpx is None:
+        raise ImportError(
+            "The async API requires httpx. Install it with "
+            "'pip install pytacite[async]'."
+        )
+
+
+def _create_async_session():
+
+    _require_httpx()
+
+    limits = httpx.Limits(
+        max_connections=config.pool_maxsize,
+        max_keepalive_connections=config.pool_maxsize if config.keep_alive else 0,
+    )
+
+    timeout = config.timeout
+    if isinstance(timeout, tuple):
+        timeout = httpx.Timeout(None, connect=timeout[0], read=timeout[1])
+
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=timeout,
+        headers={"User-Agent": "pytacite/" + __version__},
+    )
+
+
+def get_async_session():
+    """Return the shared async HTTP client of the running event loop.
+
+    An httpx client is bound to the event loop it is used in, so there is one
+    client per loop. Its connection limit is ``config.pool_maxsize``.
+    """
+
+    loop = asyncio.get_running_loop()
+
+    if loop not in _async_sessions:
+        _async_sessions[loop] = _create_async_session()
+    return _async_sessions[loop]
+
+
+async def close_async_session():
+    """Close the async HTTP client of the running event loop."""
+
+    session = _async_sessions.pop(asyncio.get_running_loop(), None)
+
+    if session is not None:
+        await session.aclose()
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+_async_inflight = weakref.WeakKeyDictionary()
+
+
+def _single_flight(key, fetch):
+    """Call fetch, or wait for the call in flight with the same key.
+
+    Concurrent calls with the same key share the result of one call, and its
+    exception if it fails. Requests for random records are not shared.
+
+    Returns:
+        tuple: The result and whether this call made it.
+    """
+
+    if not config.coalesce_requests or "random=true" in key:
+        return fetch(), True
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+
+    if not leader:
+        return future.result(), False
+
+    try:
+        result = fetch()
+    except BaseException as err:
+        future.set_exception(err)
+        raise
+    else:
+        future.set_result(result)
+        return result, True
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+def _retrieve_exception(task):
+
+    # avoid warnings for failed fetches that no caller waits for anymore
+    if not task.cancelled():
+        task.exception()
+
+
+async def _async_single_flight(key, fetch):
+    """Async version of _single_flight, per event loop.
+
+    The call runs as a separate task, so cancelling one of the waiting calls
+    doesn't cancel the call for the others.
+    """
+
+    if not config.coalesce_requests or "random=true" in key:
+        return await fetch(), True
+
+    inflight = _async_inflight.setdefault(asyncio.get_running_loop(), {})
+
+    task = inflight.get(key)
+    leader = task is None
+    if leader:
+        task = inflight[key] = asyncio.ensure_future(fetch())
+        task.add_done_callback(lambda t: inflight.pop(key, None))
+        task.add_done_callback(_retrieve_exception)
+
+    return await asyncio.shield(task), leader
+
+
+def _request_headers():
+
+    headers = {"Accept-Encoding": accept_encoding}
+    if config.headers:
+        headers.update(config.headers)
+    if config.email is not None:
+        headers["email"] = config.email
+
+    return headers
+
+
+def _retry_delay(res, attempt):
+    """Seconds to wait before retrying the response, or None to not retry."""
+
+    if attempt >= config.max_retries:
+        return None
+
+    if res is not None:
+        if res.status_code not in config.retry_http_codes:
+            return None
+
+        delay = retry_after(res)
+        if delay is not None:
+            return delay
+
+    return backoff(attempt, config.retry_backoff_factor, config.retry_backoff_max)
+
+
+def _update_rate_limiter(res):
+
+    if config.rate_limiter is not None:
+        if res.status_code == 429:
+            config.rate_limiter.throttle()
+        else:
+            config.rate_limiter.success()
+
+
+def _check_response(res):
+
+    # handle query errors
+    if res.status_code == 403:
+        res_json = res.json()
+        if (
+            isinstance(res_json["error"], str)
+            and "query parameters" in res_json["error"]
+        ):
+            raise QueryError(res_json["message"])
+    res.raise_for_status()
 
 
 def _pipe_method(func):
+    """Apply the method to a copy of the query and return the copy."""
+
     @functools.wraps(func)
     def wrapper_decorator(self, *args, **kwargs):
-        func(self, *args, **kwargs)
-        return self
+        query = self._copy()
+        func(query, *args, **kwargs)
+        return query
 
     return wrapper_decorator
 
@@ -84,23 +369,467 @@ def _params_merge(params, add_params):
             params[k] = add_params[k]
 
 
+def _fingerprint(*parts):
+    """sha256 of the canonical JSON of parts, independent of dict order."""
+
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _cache_key(url):
+    """URL with sorted query parameters, so equal queries share cache entries."""
+
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return urlunsplit(parts._replace(query=query))
+
+
+def _id_key(record_id):
+    """8-byte digest of a record id as an int, to keep sets of seen ids compact."""
+
+    digest = hashlib.blake2b(record_id.lower().encode(), digest_size=8).digest()
+
+    return int.from_bytes(digest, "little")
+
+
+Facet = namedtuple("Facet", ["id", "title", "count"])
+
+
+def _facets(meta):
+    """Facets in the meta of a response: lists of id, title and count."""
+
+    facets = {}
+    for name, values in meta.items():
+        if isinstance(values, list) and all(
+            isinstance(v, dict) and "count" in v for v in values
+        ):
+            facets[name] = [
+                Facet(str(v.get("id")), v.get("title"), int(v["count"])) for v in values
+            ]
+
+    return facets
+
+
+def count_many(queries, max_workers=8):
+    """Count the records of multiple queries concurrently.
+
+    Counts are requested without facets, and equal queries are counted once.
+
+    Args:
+        queries (list): Queries, e.g. ``[DOIs().filter(client_id=c) for c in
+            clients]``.
+        max_workers (int, optional): Number of concurrent requests. Defaults
+            to 8.
+
+    Returns:
+        list: Number of records of each query, in the order of queries.
+    """
+
+    queries = list(queries)
+    unique = list(dict.fromkeys(queries))
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        counts = dict(zip(unique, executor.map(lambda q: q.count(), unique)))
+
+    return [counts[q] for q in queries]
+
+
+def _wire_bytes(res, default):
+    """Size of the body as received, before it was decompressed.
+
+    Read from the raw stream of a requests response, or the downloaded bytes
+    of an httpx response. Falls back to default.
+    """
+
+    n = getattr(res, "num_bytes_downloaded", None)
+
+    if n is None:
+        try:
+            n = res.raw.tell()
+        except (AttributeError, OSError):
+            n = None
+
+    return n if n else default
+
+
+def _many_results(ids, found, return_missing):
+    """Records of get_many in the order of ids, and the missing ids."""
+
+    results = [found.get(i.lower()) for i in ids]
+
+    if return_missing:
+        return results, [i for i, r in zip(ids, results) if r is None]
+    return results
+
+
+_resource_types = {}
+
+
 class QueryError(ValueError):
     pass
 
 
+def _select_fields(ent, fields):
+    """Prune the attributes and relationships of a record to fields."""
+
+    fields = set(fields)
+    pruned = {k: v for k, v in ent.items() if k in ("id", "type")}
+
+    for member in ("attributes", "relationships"):
+        if member in ent:
+            pruned[member] = {k: v for k, v in ent[member].items() if k in fields}
+
+    return pruned
+
+
+def _included_resources(res_json):
+    """Identity map of the included resources of a response."""
+
+    included = {}
+    for ent in res_json.get("included", []):
+        resource_class = _resource_types.get(ent.get("type"), dict)
+        included[(ent.get("type"), ent.get("id"))] = resource_class(ent)
+
+    # included resources can refer to each other, e.g. a client to its provider
+    for resource in included.values():
+        _link_included(resource, included)
+
+    return included
+
+
+def _link_included(ent, included):
+    """Replace relationship identifiers by the included resources."""
+
+    for rel in (ent.get("relationships") or {}).values():
+        data = rel.get("data") if isinstance(rel, dict) else None
+
+        if isinstance(data, dict):
+            rel["data"] = included.get((data.get("type"), data.get("id")), data)
+        elif isinstance(data, list):
+            rel["data"] = [included.get((d.get("type"), d.get("id")), d) for d in data]
+
+
+def _next_link(res_json):
+
+    try:
+        return res_json["links"]["next"]
+    except KeyError:
+        return None
+
+
+def _set_param(link, key, value):
+
+    parts = urlsplit(link)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+
+    if any(k == key for k, _ in params):
+        params = [(k, str(value) if k == key else v) for k, v in params]
+    else:
+        params.append((key, str(value)))
+
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+def _set_page_size(link, size):
+
+    return _set_param(link, "page[size]", size)
+
+
+# DataCite returns at most the first 10,000 records with page number paging
+_NUMBER_PAGING_WINDOW = 10000
+
+
+def _page_links(link, res_json, n, n_max):
+    """Links to the pages after the page of link, for page number paging.
+
+    The pages end at the last page of the results, the 10,000-record window
+    of page number paging, or the page with record n_max (n records have
+    been returned up to and including res_json).
+    """
+
+    params = dict(parse_qsl(urlsplit(link).query))
+    size = int(params.get("page[size]") or 25)
+    number = int(params.get("page[number]") or 1)
+
+    last = min(res_json["meta"].get("totalPages") or 0, _NUMBER_PAGING_WINDOW // size)
+    if n_max:
+        last = min(last, number + max(0, -(-(n_max - n) // size)))
+
+    return [_set_param(link, "page[number]", i) for i in range(number + 1, last + 1)]
+
+
+def _prefetch_worker(endpoint_class, link, n, n_max, buffer, stop, stats):
+    """Fetch pages ahead of the consumer and put them in the buffer.
+
+    Items are ``(res_json, error)`` tuples. ``(None, None)`` marks the end.
+    """
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        while link is not None and not (n_max and n >= n_max):
+            res_json = endpoint_class._get_raw(link, stats)
+            link = _next_link(res_json)
+            n = n + len(res_json["data"])
+
+            if not put((res_json, None)):
+                return
+    except Exception as err:
+        put((None, err))
+    else:
+        put((None, None))
+
+
+def _frame_columns(collection, columns, categorical):
+    """Columns and categorical columns, defaulting to those of the collection."""
+
+    if columns is None:
+        columns = getattr(collection, "columns", None)
+    if categorical is None:
+        categorical = [
+            c
+            for c in getattr(collection, "categorical", None) or []
+            if columns and c in columns
+        ]
+
+    return columns, categorical
+
+
+class Results(list):
+    """List of records returned by get.
+
+    Results can be converted to a DataFrame or an Arrow table with the
+    default columns of the collection.
+    """
+
+    def __init__(self, records=(), collection=None):
+
+        super().__init__(records)
+        self.collection = collection
+
+    def to_pandas(self, columns=None, categorical=None):
+        """Return the records as a pandas DataFrame. See Paginator.to_pandas."""
+
+        return to_pandas([self], *_frame_columns(self.collection, columns, categorical))
+
+    def to_arrow(self, columns=None, categorical=None):
+        """Return the records as an Arrow table. See Paginator.to_arrow."""
+
+        return to_arrow([self], *_frame_columns(self.collection, columns, categorical))
+
+
 class Paginator:
-    def __init__(self, link, endpoint_class=None, n_max=None):
+    def __init__(
+        self,
+        link,
+        endpoint_class=None,
+        n_max=None,
+        prefetch=0,
+        stream=False,
+        checkpoint=None,
+        checkpoint_every=1,
+        resume_from=None,
+        fingerprint=None,
+        max_workers=None,
+        ordered=True,
+    ):
+
+        if prefetch and stream:
+            raise ValueError("Prefetching is not possible for streamed pages.")
+        if max_workers and (prefetch or stream):
+            raise ValueError(
+                "Parallel paging can't be combined with prefetching or streaming."
+            )
+        if max_workers and checkpoint and not ordered:
+            raise ValueError("Checkpoints require pages in order (ordered=True).")
 
         self.endpoint_class = endpoint_class
         self.link = link
         self.n_max = n_max
+        self.prefetch = prefetch
+        self.stream = stream
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.max_workers = max_workers
+        self.ordered = ordered
+        self.fingerprint = fingerprint or hashlib.sha256(link.encode()).hexdigest()
+
+        self.n = 0
+        self.pages = 0
+        self.stats = Stats()
+
+        self._buffer = None
+        self._stop = None
+        self._page = None
+        self._pages = None
+
+        if resume_from is not None:
+            self._resume(resume_from)
+
+    def _resume(self, path):
+
+        with open(path) as f:
+            state = json.load(f)
+
+        if state["fingerprint"] != self.fingerprint:
+            raise ValueError(
+                f"Checkpoint {path} belongs to a different query and can't be resumed."
+            )
+
+        self.link = state["link"]
+        self.n = state["n"]
+        self.pages = state["pages"]
+
+    def _save_checkpoint(self, force=False):
+        """Save the next link and the number of records returned so far.
+
+        The state is written to a temporary file and moved into place, so the
+        checkpoint file is never partially written.
+        """
+
+        if self.checkpoint is None or self.pages == 0:
+            return
+        if not force and self.pages % self.checkpoint_every != 0:
+            return
+
+        state = {
+            "fingerprint": self.fingerprint,
+            "link": self.link,
+            "n": self.n,
+            "pages": self.pages,
+        }
+
+        tmp_path = str(self.checkpoint) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        # the shared session is left open for other paginators and threads
+        self.close()
 
     def __iter__(self):
 
-        self.n = 0
+        if self.prefetch:
+            self._start_prefetch()
 
         return self
 
+    def _start_prefetch(self):
+
+        self.close()
+
+        self._buffer = queue.Queue(maxsize=self.prefetch)
+        self._stop = threading.Event()
+
+        # stop the worker when the paginator is garbage collected
+        weakref.finalize(self, self._stop.set)
+
+        threading.Thread(
+            target=_prefetch_worker,
+            args=(
+                self.endpoint_class,
+                self.link,
+                self.n,
+                self.n_max,
+                self._buffer,
+                self._stop,
+                self.stats,
+            ),
+            daemon=True,
+        ).start()
+
+    def close(self):
+        """Stop fetching pages in the background and release a streamed page."""
+
+        if self._page is not None:
+            self._page.abort()
+            self._page = None
+
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+            self._buffer = None
+
+        if self._pages is not None:
+            self._pages.close()
+
+    def to_jsonl(self, path):
+        """Write the records of all pages to a JSON Lines file.
+
+        Pages are written as they are fetched, so the records never have to
+        fit in memory. See pytacite.export.write_jsonl.
+
+        Returns:
+            int: Number of records written.
+        """
+
+        return write_jsonl(self, path)
+
+    def to_parquet(self, path, columns=None, row_group_size=10000):
+        """Write the records of all pages to a Parquet file.
+
+        See pytacite.export.write_parquet. Requires pyarrow.
+
+        Example:
+
+            DOIs().filter(prefix="10.5438").paginate(n_max=None).to_parquet(
+                "dois.parquet", columns=["id", "attributes.publicationYear"]
+            )
+        """
+
+        return write_parquet(self, path, columns, row_group_size)
+
+    def to_arrow_ipc(self, path, columns=None, batch_size=10000):
+        """Write the records of all pages to an Arrow IPC stream file.
+
+        See pytacite.export.write_arrow_ipc. Requires pyarrow.
+        """
+
+        return write_arrow_ipc(self, path, columns, batch_size)
+
+    def to_pandas(self, columns=None, categorical=None):
+        """Return the records of all pages as a pandas DataFrame.
+
+        Columns are built page by page, without a list of all records. The
+        collection defines the default columns, e.g. the title, creators and
+        resource type of DOIs, and which of them are categorical. Uses pyarrow
+        if it is installed. See pytacite.export.to_pandas.
+
+        Example:
+
+            df = DOIs().filter(prefix="10.5438").paginate(n_max=None).to_pandas()
+        """
+
+        return to_pandas(
+            self, *_frame_columns(self.endpoint_class, columns, categorical)
+        )
+
+    def to_arrow(self, columns=None, categorical=None, batch_size=10000):
+        """Return the records of all pages as an Arrow table.
+
+        Categorical columns are dictionary encoded. Requires pyarrow. See
+        pytacite.export.to_arrow.
+        """
+
+        return to_arrow(
+            self,
+            *_frame_columns(self.endpoint_class, columns, categorical),
+            batch_size,
+        )
+
     def _is_max(self):
         if self.n_max and self.n >= self.n_max:
             return True
@@ -108,33 +837,352 @@ class Paginator:
 
     def __next__(self):
 
+        # the previous page has been processed when the next one is requested
+        self._finish_streamed_page()
+        self._save_checkpoint()
+
+        try:
+            return self._next()
+        except StopIteration:
+            self._save_checkpoint(force=True)
+            raise
+
+    def _next(self):
+
+        if self._buffer is not None:
+            return self._next_prefetched(self._buffer.get())
+
+        if self.max_workers:
+            return self._next_parallel()
+
         if self.link is None or self._is_max():
             raise StopIteration
 
-        res_json = self.endpoint_class._get_raw(self.link)
-        results = [self.endpoint_class.resource_class(ent) for ent in res_json["data"]]
+        if self.stream:
+            self._page = self.endpoint_class._stream_raw(self.link, self.stats)
+            self.pages = self.pages + 1
+            return self._page
+
+        res_json = self.endpoint_class._get_raw(self.link, self.stats)
+
+        return self._next_page(res_json)
+
+    def _next_parallel(self):
+
+        if self._is_max():
+            self.close()
+            raise StopIteration
+
+        if self._pages is None:
+            if self.link is None:
+                raise StopIteration
+            self._pages = self._parallel_pages(self.link, self.n)
 
         try:
-            self.link = res_json["links"]["next"]
-        except KeyError:
+            res_json = next(self._pages)
+        except StopIteration:
             self.link = None
+            raise
+
+        return self._next_page(res_json)
+
+    def _parallel_pages(self, link, n):
+        """Fetch the page of link, then the remaining pages concurrently.
+
+        At most max_workers pages are fetched at once. Pages are yielded in
+        order, or as they arrive if ordered is False.
+        """
+
+        res_json = self.endpoint_class._get_raw(link, self.stats)
+        yield res_json
+
+        links = iter(_page_links(link, res_json, n + len(res_json["data"]), self.n_max))
+        pending = deque()
+
+        with ThreadPoolExecutor(self.max_workers) as executor:
+
+            def submit():
+                for page_link in links:
+                    pending.append(
+                        executor.submit(
+                            self.endpoint_class._get_raw, page_link, self.stats
+                        )
+                    )
+                    return
+
+            try:
+                for _ in range(self.max_workers):
+                    submit()
+
+                while pending:
+                    if self.ordered:
+                        done = [pending.popleft()]
+                    else:
+                        done = wait(pending, return_when=FIRST_COMPLETED).done
+                        for future in done:
+                            pending.remove(future)
+
+                    for future in done:
+                        submit()
+                        yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _finish_streamed_page(self):
+
+        # the next link follows the data, so finish the previous page first
+        if self._page is not None:
+            self._page.close()
+            self.link = self._page.links.get("next")
+            self.n = self.n + self._page.n
+            self._page = None
+
+    def _next_prefetched(self, item):
+
+        res_json, err = item
+
+        if err is not None:
+            self.close()
+            raise err
+
+        if res_json is None:
+            self.close()
+            self.link = None
+            raise StopIteration
 
+        return self._next_page(res_json)
+
+    def _next_page(self, res_json):
+
+        results = list(self.endpoint_class._resources(res_json))
+
+        self.link = _next_link(res_json)
         self.n = self.n + len(results)
+        self.pages = self.pages + 1
 
         return results
 
 
+class AsyncPaginator(Paginator):
+    """Paginator to use with ``async for``."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def __aiter__(self):
+
+        if self.stream:
+            raise ValueError("Streamed pages are not supported for async paging.")
+
+        if self.prefetch:
+            self._start_prefetch()
+
+        return self
+
+    def _start_prefetch(self):
+
+        self.close()
+
+        self._buffer = asyncio.Queue(maxsize=self.prefetch)
+        self._worker = asyncio.ensure_future(self._prefetch_task(self.link, self.n))
+
+    async def _prefetch_task(self, link, n):
+
+        try:
+            while link is not None and not (self.n_max and n >= self.n_max):
+                res_json = await self.endpoint_class._get_raw(link, self.stats)
+                link = _next_link(res_json)
+                n = n + len(res_json["data"])
+
+                await self._buffer.put((res_json, None))
+        except Exception as err:
+            await self._buffer.put((None, err))
+        else:
+            await self._buffer.put((None, None))
+
+    def close(self):
+
+        if getattr(self, "_worker", None) is not None:
+            self._worker.cancel()
+            self._worker = None
+            self._buffer = None
+
+        for task in getattr(self, "_tasks", []):
+            task.cancel()
+
+    async def __anext__(self):
+
+        self._save_checkpoint()
+
+        try:
+            return await self._anext()
+        except StopAsyncIteration:
+            self._save_checkpoint(force=True)
+            raise
+
+    async def _anext(self):
+
+        if self._buffer is not None:
+            try:
+                return self._next_prefetched(await self._buffer.get())
+            except StopIteration:
+                raise StopAsyncIteration from None
+
+        if self.max_workers:
+            return await self._anext_parallel()
+
+        if self.link is None or self._is_max():
+            raise StopAsyncIteration
+
+        res_json = await self.endpoint_class._get_raw(self.link, self.stats)
+
+        return self._next_page(res_json)
+
+    async def _anext_parallel(self):
+
+        if self._is_max():
+            self.close()
+            raise StopAsyncIteration
+
+        if self._pages is None:
+            if self.link is None:
+                raise StopAsyncIteration
+            self._pages = self._parallel_pages(self.link, self.n)
+
+        try:
+            res_json = await self._pages.__anext__()
+        except StopAsyncIteration:
+            self.link = None
+            raise
+
+        return self._next_page(res_json)
+
+    async def _parallel_pages(self, link, n):
+
+        res_json = await self.endpoint_class._get_raw(link, self.stats)
+        yield res_json
+
+        links = iter(_page_links(link, res_json, n + len(res_json["data"]), self.n_max))
+        self._tasks = pending = deque()
+
+        def submit():
+            for page_link in links:
+                pending.append(
+                    asyncio.ensure_future(
+                        self.endpoint_class._get_raw(page_link, self.stats)
+                    )
+                )
+                return
+
+        try:
+            for _ in range(self.max_workers):
+                submit()
+
+            while pending:
+                if self.ordered:
+                    done = [pending.popleft()]
+                else:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        pending.remove(task)
+
+                for task in done:
+                    submit()
+                    yield await task
+        finally:
+            for task in pending:
+                task.cancel()
+
+
 class BaseDataCite:
-    """Base class for DataCite objects."""
+    """Base class for DataCite objects.
+
+    Queries are immutable: pipe methods like filter and select return a new
+    query, and get, count and paginate don't change the query. A query can
+    be reused and shared between threads. The URL is computed once, and the
+    fingerprint identifies equal queries regardless of the order of the
+    pipe methods.
+    """
+
+    paginator_class = Paginator
+
+    # default columns of to_pandas and to_arrow, see pytacite.export
+    columns = None
+    categorical = None
+
+    def __init_subclass__(cls, **kwargs):
+
+        super().__init_subclass__(**kwargs)
+
+        # register the resource class for the JSON:API type, e.g. "dois"
+        if "resource_class" in cls.__dict__:
+            _resource_types[cls()._collection_name()] = cls.resource_class
 
     def __init__(self, params=None):
 
         self.params = params
+        self.stats = Stats()
+
+        self._url = None
+        self._fingerprint = None
+
+    def __eq__(self, other):
+
+        return type(self) is type(other) and self.fingerprint == other.fingerprint
+
+    def __hash__(self):
+
+        return hash(self.fingerprint)
 
     def _collection_name(self):
 
         return self.__class__.__name__.lower()
 
+    def _resource(self, ent):
+
+        fields = self.params.get(self._fields_param()) if self.params else None
+        if fields is not None:
+            ent = _select_fields(ent, fields)
+
+        return self.resource_class(ent)
+
+    def _resources(self, res_json):
+        """Yield the records of a response.
+
+        Included resources are built once per response and linked into the
+        relationships of the records.
+        """
+
+        included = _included_resources(res_json)
+
+        data = res_json["data"]
+        for ent in [data] if isinstance(data, dict) else data:
+            if included:
+                _link_included(ent, included)
+            yield self._resource(ent)
+
+    def _fields_param(self):
+
+        return f"fields[{self._collection_name()}]"
+
+    def _copy(self, share_stats=False):
+        """Copy of the query with its own stats, e.g. for pipe methods.
+
+        Internal copies, e.g. to build the URL of a request, share the stats.
+        """
+
+        query = self.__class__(params=copy.deepcopy(self.params))
+        if share_stats:
+            query.stats = self.stats
+
+        return query
+
     def _full_collection_name(self):
 
         return config.api_url + "/" + self._collection_name()
@@ -143,16 +1191,43 @@ class BaseDataCite:
 
         return getattr(self, key)
 
+    def _record_url(self, record_id):
+
+        # DOIs can contain "#" and "?", e.g. SICI DOIs
+        url = self._full_collection_name() + "/" + quote(record_id, safe="/:")
+
+        fields = self.params.get(self._fields_param()) if self.params else None
+        if fields is not None:
+            url = url + "?" + self._fields_param() + "=" + ",".join(fields)
+
+        return url
+
     def __getitem__(self, record_id):
 
-        url = self._full_collection_name() + "/" + record_id
-        res_json = self._get_raw(url)["data"]
+        res_json = self._get_raw(self._record_url(record_id))
+
+        return next(self._resources(res_json))
 
-        return self.resource_class(res_json)
+    @property
+    def fingerprint(self):
+        """sha256 of the collection and the canonical form of the params."""
+
+        if self._fingerprint is None:
+            self._fingerprint = _fingerprint(self._collection_name(), self.params)
+
+        return self._fingerprint
 
     @property
     def url(self):
 
+        # computed once per API URL
+        if self._url is None or self._url[0] != config.api_url:
+            self._url = (config.api_url, self._build_url())
+
+        return self._url[1]
+
+    def _build_url(self):
+
         if not self.params:
             return self._full_collection_name()
 
@@ -183,38 +1258,212 @@ class BaseDataCite:
         else:
             self.params[argument] = new_params
 
-        logging.debug("Params updated:", self.params)
+        self._url = None
+        self._fingerprint = None
 
-    def _get_raw(self, url):
+        logging.debug("Params updated: %s", self.params)
 
-        res = requests.get(
-            url,
-            headers={"User-Agent": "pytacite/" + __version__, "email": config.email},
-        )
+    def _cache_get(self, url):
+
+        if config.cache is None or "random=true" in url:
+            return None
+
+        return config.cache.get(_cache_key(url))
+
+    def _cache_set(self, url, body):
+
+        if config.cache is None or "random=true" in url:
+            return
 
-        # handle query errors
-        if res.status_code == 403:
-            res_json = res.json()
-            if (
-                isinstance(res_json["error"], str)
-                and "query parameters" in res_json["error"]
+        config.cache.set(_cache_key(url), body, collection=self._collection_name())
+
+    def _emit(self, stats, event):
+        """Pass the metrics of a request to the stats and config.hooks."""
+
+        if not event.cache_hit:
+            logging.debug(
+                "GET %s %s (%d bytes, %d retries) in %.3f seconds",
+                event.url,
+                event.status_code,
+                event.bytes,
+                event.retries,
+                event.connect + event.transfer + (event.decode or 0.0),
+            )
+
+        self.stats(event)
+        if stats is not None:
+            stats(event)
+        for hook in config.hooks:
+            hook(event)
+
+    def _cached(self, url, stats):
+
+        start = time.perf_counter()
+
+        res_json = self._cache_get(url)
+        if res_json is not None:
+            self._emit(
+                stats,
+                RequestEvent(
+                    url,
+                    self._collection_name(),
+                    None,
+                    0.0,
+                    0.0,
+                    time.perf_counter() - start,
+                    0,
+                    0,
+                    _n_records(res_json),
+                    True,
+                ),
+            )
+
+        return res_json
+
+    def _decode(self, url, stats, res, retries, connect, transfer, coalesced=False):
+
+        decode = 0.0
+        records = 0
+
+        try:
+            _check_response(res)
+
+            start = time.perf_counter()
+            res_json = get_decoder(config.json_decoder)(res.content)
+            decode = time.perf_counter() - start
+            records = _n_records(res_json)
+        finally:
+            self._emit(
+                stats,
+                RequestEvent(
+                    url,
+                    self._collection_name(),
+                    res.status_code,
+                    0.0 if coalesced else connect,
+                    0.0 if coalesced else transfer,
+                    decode,
+                    0 if coalesced else _wire_bytes(res, len(res.content)),
+                    0 if coalesced else retries,
+                    records,
+                    False,
+                    coalesced,
+                ),
+            )
+
+        if not coalesced:
+            self._cache_set(url, res.content)
+
+        return res_json
+
+    def _send(self, url, stream=False):
+        """Request url, retrying connection errors and transient HTTP errors.
+
+        Retries back off exponentially with jitter, or wait as long as the
+        Retry-After header asks. Requests wait for config.rate_limiter.
+
+        Returns:
+            tuple: The response, the number of retries, and the time until
+            the headers arrived and to read the body of the last attempt.
+        """
+
+        attempt = 0
+
+        while True:
+            if config.rate_limiter is not None:
+                time.sleep(config.rate_limiter.acquire())
+
+            start = time.perf_counter()
+
+            try:
+                res = get_session().get(
+                    url,
+                    headers=_request_headers(),
+                    timeout=config.timeout,
+                    stream=stream,
+                )
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                # connection reset or truncated body while reading the response
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ContentDecodingError,
             ):
-                raise QueryError(res_json["message"])
-        res.raise_for_status()
+                delay = _retry_delay(None, attempt)
+                if delay is None:
+                    raise
+            else:
+                _update_rate_limiter(res)
+
+                delay = _retry_delay(res, attempt)
+                if delay is None:
+                    connect = res.elapsed.total_seconds()
+                    transfer = max(0.0, time.perf_counter() - start - connect)
+                    return res, attempt, connect, transfer
+                res.close()
+
+            logging.debug("Retrying %s in %.1f seconds", url, delay)
+            time.sleep(delay)
+            attempt = attempt + 1
+
+    def _get_raw(self, url, stats=None):
+
+        res_json = self._cached(url, stats)
+        if res_json is not None:
+            return res_json
+
+        result, leader = _single_flight(_cache_key(url), lambda: self._send(url))
+
+        return self._decode(url, stats, *result, coalesced=not leader)
+
+    def _stream_raw(self, url, stats=None):
+
+        res, retries, connect, _ = self._send(url, stream=True)
+        chunks = _Counted(res.iter_content(chunk_size=65536))
+        page = None
+
+        def close():
+            res.close()
+            self._emit(
+                stats,
+                RequestEvent(
+                    url,
+                    self._collection_name(),
+                    res.status_code,
+                    connect,
+                    chunks.transfer,
+                    None,
+                    _wire_bytes(res, chunks.bytes),
+                    retries,
+                    0 if page is None else page.n,
+                    False,
+                ),
+            )
 
-        return res.json()
+        try:
+            _check_response(res)
+        except Exception:
+            close()
+            raise
 
-    def get(self, return_meta=False, page=None, per_page=None, cursor=None):
+        page = StreamedPage(chunks, self._resource, close=close)
+
+        return page
+
+    def _get_url(self, page=None, per_page=None, cursor=None):
 
         if per_page is not None and (per_page < 1 or per_page > 200):
             raise ValueError("per_page should be a number between 1 and 200.")
 
-        self._add_params("page[size]", per_page)
-        self._add_params("page[number]", page)
-        self._add_params("page[cursor]", cursor)
+        query = self._copy(share_stats=True)
+        query._add_params("page[size]", per_page)
+        query._add_params("page[number]", page)
+        query._add_params("page[cursor]", cursor)
+
+        return query.url
+
+    def _get_results(self, res_json, return_meta=False):
 
-        res_json = self._get_raw(self.url)
-        results = [self.resource_class(ent) for ent in res_json["data"]]
+        results = Results(self._resources(res_json), self)
 
         # return result and metadata
         if return_meta:
@@ -222,12 +1471,200 @@ class BaseDataCite:
         else:
             return results
 
+    def get(self, return_meta=False, page=None, per_page=None, cursor=None):
+
+        res_json = self._get_raw(self._get_url(page, per_page, cursor))
+
+        return self._get_results(res_json, return_meta)
+
+    def _count_url(self):
+
+        # facets are expensive for the server and not needed for the total
+        query = self._copy(share_stats=True)
+        query._add_params("disable-facets", "true")
+
+        return query._get_url(per_page=1)
+
     def count(self):
-        _, m = self.get(return_meta=True, per_page=1)
 
-        return m["total"]
+        return self._get_raw(self._count_url())["meta"]["total"]
+
+    def facets(self, *names):
+        """Return the facets of the query, from the meta of one request.
+
+        Args:
+            *names: Names of the facets to return, e.g. "published" or
+                "resourceTypes". Defaults to all facets.
+
+        Returns:
+            dict: Facet name and list of Facet(id, title, count) tuples.
+
+        Example:
+
+            DOIs().filter(client_id="cern.zenodo").facets("published")
+            # {'published': [Facet(id='2023', title='2023', count=...), ...]}
+        """
+
+        facets = _facets(self._get_raw(self._get_url(per_page=1))["meta"])
+
+        if names:
+            return {name: facets.get(name, []) for name in names}
+        return facets
+
+    def _batch_query(self, ids):
+        """Query for the records with the given ids.
+
+        Collections that can't look up multiple ids in one list query return
+        None, and get_many falls back to single lookups.
+        """
+
+        return None
+
+    def _get_or_none(self, record_id):
 
-    def paginate(self, method="cursor", page=1, per_page=None, cursor="*", n_max=10000):
+        try:
+            return self[record_id]
+        except requests.HTTPError as err:
+            if err.response is not None and err.response.status_code in (400, 404):
+                return None
+            raise
+
+    def get_many(self, ids, batch_size=100, max_workers=4, return_missing=False):
+        """Get the records for a list of ids.
+
+        Ids are looked up in batches with as few list queries as possible.
+        Ids that a batch didn't return are missing. The ids of failed batches,
+        and all ids for collections without list lookups, are looked up one
+        by one, concurrently. Missing ids are returned as None.
+
+        Args:
+            ids (list): Ids of the records.
+            batch_size (int, optional): Number of ids per list query. At most
+                200. Defaults to 100.
+            max_workers (int, optional): Number of concurrent requests.
+                Defaults to 4.
+            return_missing (bool, optional): Return the ids that weren't found
+                as well. Defaults to False.
+
+        Returns:
+            list: Records in the order of ids, None for ids that weren't found.
+            If return_missing is True, a tuple of the records and the missing
+            ids.
+        """
+
+        ids = list(ids)
+        found = {}
+        remaining = []
+
+        def get_batch(batch):
+            query = self._batch_query(batch)
+            if query is None:
+                return None
+
+            # e.g. a query the server can't parse, the ids are looked up singly
+            try:
+                return query.get(per_page=len(batch))
+            except (requests.HTTPError, QueryError) as err:
+                logging.debug("Batch lookup failed: %s", err)
+                return None
+
+        batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            for batch, records in zip(batches, executor.map(get_batch, batches)):
+                if records is None:
+                    remaining.extend(batch)
+                    continue
+
+                for record in records:
+                    found[record["id"].lower()] = record
+
+            remaining = list(dict.fromkeys(remaining))
+            for record_id, record in zip(
+                remaining, executor.map(self._get_or_none, remaining)
+            ):
+                if record is not None:
+                    found[record_id.lower()] = record
+
+        return _many_results(ids, found, return_missing)
+
+    def _records_link(self, n_max, per_page, cursor):
+
+        query = self._copy(share_stats=True)
+        query._add_params(
+            "page[size]", per_page if n_max is None else min(per_page, n_max)
+        )
+        query._add_params("page[cursor]", cursor)
+
+        return query.url
+
+    def iter_records(self, n_max=None, per_page=25, cursor="*", stream=False):
+        """Iterate over the records of the query with cursor paging.
+
+        Unlike paginate, which returns whole pages, this returns exactly n_max
+        records. The size of the last page is reduced, so no records are
+        downloaded that aren't returned.
+
+        Args:
+            n_max (int, optional): Number of records to return. Defaults to None
+                (all records).
+            per_page (int, optional): Entries per page. Defaults to 25.
+            cursor (str, optional): Cursor to start from. Defaults to "*".
+            stream (bool, optional): Parse pages incrementally from the
+                response, see paginate. Defaults to False.
+
+        Yields:
+            Records of the query.
+        """
+
+        link = self._records_link(n_max, per_page, cursor)
+        remaining = n_max
+
+        while link is not None and remaining != 0:
+            if stream:
+                page = self._stream_raw(link)
+                records = page
+            else:
+                page = None
+                res_json = self._get_raw(link)
+                records = self._resources(res_json)
+
+            # release the streamed response if the consumer stops early
+            try:
+                for record in records:
+                    yield record
+
+                    if remaining is not None:
+                        remaining = remaining - 1
+                        if remaining == 0:
+                            break
+            finally:
+                if page is not None:
+                    page.close()
+
+            if stream:
+                link = page.links.get("next")
+            else:
+                link = _next_link(res_json)
+
+            if link is not None and remaining is not None:
+                link = _set_page_size(link, min(per_page, remaining))
+
+    def paginate(
+        self,
+        method="cursor",
+        page=1,
+        per_page=None,
+        cursor="*",
+        n_max=10000,
+        prefetch=0,
+        stream=False,
+        checkpoint=None,
+        checkpoint_every=1,
+        resume_from=None,
+        max_workers=None,
+        ordered=True,
+    ):
         """Used for paging results of large responses using cursor paging.
 
         DataCite offers two methods for paging: basic paging and cursor paging.
@@ -239,19 +1676,242 @@ class BaseDataCite:
             cursor (str, optional): _description_. Defaults to "*".
             n_max (int, optional): Number of max results (not pages) to return.
                 Defaults to 10000.
+            prefetch (int, optional): Number of pages to fetch ahead in the
+                background while the current page is processed. The buffer holds
+                at most this number of pages. Defaults to 0 (no prefetching).
+            stream (bool, optional): Parse pages incrementally from the
+                response. Each page is an iterator that decodes one record at a
+                time, so memory use depends on the record size instead of the
+                page size. Streamed pages bypass the cache. Defaults to False.
+            checkpoint (str, optional): Path of a state file. The next link and
+                the number of records returned so far are saved to this file
+                when the next page is requested, so the state only covers pages
+                that have been processed. Defaults to None.
+            checkpoint_every (int, optional): Save the state every this number
+                of pages. Defaults to 1.
+            resume_from (str, optional): Path of a state file to resume paging
+                from. Raises a ValueError if the state file belongs to another
+                query. Defaults to None.
+            max_workers (int, optional): Fetch pages concurrently with this
+                number of workers. Only for method="number": the first page
+                gives the number of pages (at most the first 10,000 records),
+                and the remaining pages are fetched in parallel. Defaults to
+                None (one page at a time).
+            ordered (bool, optional): Return the pages of parallel paging in
+                order. If False, pages are returned as they arrive. Defaults
+                to True.
 
         Returns:
             Paginator: Iterator to use for returning and processing each page
             result in sequence.
         """
 
-        self._add_params("page[size]", per_page)
+        if max_workers and method != "number":
+            raise ValueError("Parallel paging requires method='number'.")
+
+        query = self._copy(share_stats=True)
+        query._add_params("page[size]", per_page)
 
         if method == "cursor":
-            self._add_params("page[cursor]", cursor)
+            query._add_params("page[cursor]", cursor)
         elif method == "number":
-            self._add_params("page[number]", page)
+            query._add_params("page[number]", page)
         else:
             raise ValueError("Method should be 'cursor' or 'number'")
 
-        return Paginator(link=self.url, endpoint_class=self, n_max=n_max)
+        return self.paginator_class(
+            link=query.url,
+            endpoint_class=self,
+            n_max=n_max,
+            prefetch=prefetch,
+            stream=stream,
+            checkpoint=checkpoint,
+            checkpoint_every=checkpoint_every,
+            resume_from=resume_from,
+            fingerprint=query.fingerprint,
+            max_workers=max_workers,
+            ordered=ordered,
+        )
+
+
+class AsyncBaseDataCite(BaseDataCite):
+    """Base class for async DataCite objects.
+
+    Async collections build their queries like their sync counterparts, but
+    ``get``, ``count`` and ``__getitem__`` are awaitable and ``paginate``
+    returns a paginator for ``async for``. Requests are made with a shared
+    httpx client, so many requests can be in flight at once.
+    """
+
+    paginator_class = AsyncPaginator
+
+    def __init__(self, params=None):
+
+        # fail early, before httpx exceptions are referenced
+        _require_httpx()
+
+        super().__init__(params)
+
+    def _collection_name(self):
+
+        # AsyncDOIs -> dois
+        return self.__class__.__name__[len("Async") :].lower()
+
+    async def __getitem__(self, record_id):
+
+        res_json = await self._get_raw(self._record_url(record_id))
+
+        return next(self._resources(res_json))
+
+    async def _send(self, url):
+
+        attempt = 0
+
+        while True:
+            if config.rate_limiter is not None:
+                await asyncio.sleep(config.rate_limiter.acquire())
+
+            start = time.perf_counter()
+
+            try:
+                session = get_async_session()
+                res = await session.send(
+                    session.build_request("GET", url, headers=_request_headers()),
+                    stream=True,
+                )
+                connect = time.perf_counter() - start
+                await res.aread()
+            except httpx.TransportError:
+                delay = _retry_delay(None, attempt)
+                if delay is None:
+                    raise
+            else:
+                _update_rate_limiter(res)
+
+                delay = _retry_delay(res, attempt)
+                if delay is None:
+                    transfer = time.perf_counter() - start - connect
+                    return res, attempt, connect, transfer
+
+            logging.debug("Retrying %s in %.1f seconds", url, delay)
+            await asyncio.sleep(delay)
+            attempt = attempt + 1
+
+    async def _get_raw(self, url, stats=None):
+
+        res_json = self._cached(url, stats)
+        if res_json is not None:
+            return res_json
+
+        result, leader = await _async_single_flight(
+            _cache_key(url), lambda: self._send(url)
+        )
+
+        return self._decode(url, stats, *result, coalesced=not leader)
+
+    async def _get_or_none(self, record_id):
+
+        try:
+            return await self[record_id]
+        except httpx.HTTPStatusError as err:
+            if err.response.status_code in (400, 404):
+                return None
+            raise
+
+    async def get_many(self, ids, batch_size=100, max_workers=4, return_missing=False):
+        """Get the records for a list of ids. See BaseDataCite.get_many."""
+
+        ids = list(ids)
+        found = {}
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def get_batch(batch):
+            query = self._batch_query(batch)
+            if query is None:
+                return None
+
+            async with semaphore:
+                try:
+                    return await query.get(per_page=len(batch))
+                except (httpx.HTTPStatusError, QueryError) as err:
+                    logging.debug("Batch lookup failed: %s", err)
+                    return None
+
+        async def get_one(record_id):
+            async with semaphore:
+                return await self._get_or_none(record_id)
+
+        batches = [ids[i : i + batch_size] for i in range(0, len(ids), batch_size)]
+        remaining = []
+
+        for batch, records in zip(
+            batches, await asyncio.gather(*[get_batch(b) for b in batches])
+        ):
+            if records is None:
+                remaining.extend(batch)
+                continue
+
+            for record in records:
+                found[record["id"].lower()] = record
+
+        remaining = list(dict.fromkeys(remaining))
+        for record_id, record in zip(
+            remaining, await asyncio.gather(*[get_one(i) for i in remaining])
+        ):
+            if record is not None:
+                found[record_id.lower()] = record
+
+        return _many_results(ids, found, return_missing)
+
+    async def get(self, return_meta=False, page=None, per_page=None, cursor=None):
+
+        res_json = await self._get_raw(self._get_url(page, per_page, cursor))
+
+        return self._get_results(res_json, return_meta)
+
+    async def count(self):
+
+        return (await self._get_raw(self._count_url()))["meta"]["total"]
+
+    async def facets(self, *names):
+
+        facets = _facets((await self._get_raw(self._get_url(per_page=1)))["meta"])
+
+        if names:
+            return {name: facets.get(name, []) for name in names}
+        return facets
+
+    async def iter_records(self, n_max=None, per_page=25, cursor="*"):
+
+        link = self._records_link(n_max, per_page, cursor)
+        remaining = n_max
+
+        while link is not None and remaining != 0:
+            res_json = await self._get_raw(link)
+
+            for record in self._resources(res_json):
+                yield record
+
+                if remaining is not None:
+                    remaining = remaining - 1
+                    if remaining == 0:
+                        break
+
+            link = _next_link(res_json)
+
+            if link is not None and remaining is not None:
+                link = _set_page_size(link, min(per_page, remaining))
+
+
+def _iter_records(items, per_page=1000):
+    """Records of a query, of a paginator or other iterable of pages, or of an
+    iterable of records. Queries are fetched with cursor paging."""
+
+    if isinstance(items, BaseDataCite):
+        items = items.iter_records(per_page=per_page)
+
+    for item in items:
+        if isinstance(item, dict):
+            yield item
+        else:
+            yield from item
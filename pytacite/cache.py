@@ -0,0 +1,153 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from pytacite.base import config
+from pytacite.decode import get_decoder
+
+
+class ResponseCache:
+    """Persistent cache of DataCite API responses in a SQLite database.
+
+    Responses are stored by URL. Entries expire after a time-to-live that can
+    be set per collection. When the cache grows beyond ``max_size`` bytes, the
+    least recently used entries are evicted. Enable the cache with
+
+        pytacite.config.cache = ResponseCache("datacite-cache.sqlite")
+
+    Args:
+        path (str or Path): Location of the SQLite database.
+        ttl (int, optional): Time-to-live of entries in seconds. Defaults to
+            86400 (1 day).
+        ttls (dict, optional): Time-to-live per collection, e.g.
+            ``{"events": 600}``. Collections not in ttls use ``ttl``.
+        max_size (int, optional): Maximum total size of the cached responses
+            in bytes. Defaults to 1 GB.
+    """
+
+    def __init__(self, path, ttl=86400, ttls=None, max_size=1024**3):
+
+        self.path = Path(path).expanduser()
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, collection TEXT, body BLOB, size INTEGER, "
+            "created REAL, accessed REAL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+        self._size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def _ttl(self, collection):
+
+        return self.ttls.get(collection, self.ttl)
+
+    def get(self, url):
+        """Return the decoded response for url, or None if not cached."""
+
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, size, collection, created FROM responses WHERE url=?",
+                (url,),
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            body, size, collection, created = row
+
+            if now - created > self._ttl(collection):
+                self._conn.execute("DELETE FROM responses WHERE url=?", (url,))
+                self._size -= size
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET accessed=? WHERE url=?", (now, url)
+            )
+            self.hits += 1
+
+        return get_decoder(config.json_decoder)(body)
+
+    def set(self, url, body, collection=None):
+        """Store the raw response body (bytes) of url."""
+
+        now = time.time()
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE url=?", (url,)
+            ).fetchone()
+            if old is not None:
+                self._size -= old[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, collection, body, len(body), now, now),
+            )
+            self._size += len(body)
+
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+
+        # walk the accessed index only until enough space is freed
+        cursor = self._conn.execute("SELECT url, size FROM responses ORDER BY accessed")
+
+        evicted = []
+        for url, size in cursor:
+            if self._size <= self.max_size:
+                break
+            evicted.append((url,))
+            self._size -= size
+        cursor.close()
+
+        self._conn.executemany("DELETE FROM responses WHERE url=?", evicted)
+        self.evictions += len(evicted)
+
+    def clear(self):
+        """Remove all entries from the cache."""
+
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    def close(self):
+
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def stats(self):
+        """Hit and miss statistics and the size of the cache."""
+
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries[0],
+            "size": self._size,
+        }
@@ -0,0 +1,70 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+
+def get_decoder(decoder="auto"):
+    """Return a function that decodes a JSON document from bytes.
+
+    Args:
+        decoder (str or callable, optional): "orjson", "simdjson", "json", or
+            a function that takes bytes. "auto" uses the fastest installed
+            library, in the order orjson, simdjson, json. Defaults to "auto".
+
+    Returns:
+        callable: Function that decodes bytes.
+    """
+
+    if callable(decoder):
+        return decoder
+
+    if decoder == "auto":
+        if orjson is not None:
+            return orjson.loads
+        if simdjson is not None:
+            return simdjson.loads
+        return json.loads
+
+    if decoder == "orjson":
+        if orjson is None:
+            raise ImportError("The orjson decoder requires 'pip install orjson'.")
+        return orjson.loads
+
+    if decoder == "simdjson":
+        if simdjson is None:
+            raise ImportError("The simdjson decoder requires 'pip install pysimdjson'.")
+        return simdjson.loads
+
+    if decoder == "json":
+        return json.loads
+
+    raise ValueError(
+        "json_decoder should be 'auto', 'orjson', 'simdjson', 'json' or a function."
+    )
+
+
+def _accept_encoding():
+    """Content encodings that can be decoded with the installed libraries."""
+
+    encodings = ["gzip", "deflate"]
+
+    for module in ["brotli", "brotlicffi"]:
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        encodings.append("br")
+        break
+
+    return ", ".join(encodings)
+
+
+accept_encoding = _accept_encoding()
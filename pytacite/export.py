@@ -0,0 +1,319 @@
+import json
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def _require_pyarrow():
+
+    if pa is None:
+        raise ImportError(
+            "Exporting to Parquet and Arrow requires pyarrow. Install it with "
+            "'pip install pytacite[arrow]'."
+        )
+
+
+def _getter(path):
+    """Getter for a dotted path, e.g. "attributes.titles.0.title".
+
+    A "*" maps the rest of the path over a list, e.g.
+    "attributes.creators.*.name" returns the names of all creators. These
+    values become list columns.
+    """
+
+    head, star, rest = path.partition("*")
+    keys = [int(k) if k.isdigit() else k for k in head.split(".") if k]
+    get_item = _getter(rest.strip(".")) if rest.strip(".") else None
+
+    def get(record):
+        value = record
+        for k in keys:
+            try:
+                value = value[k]
+            except (KeyError, IndexError, TypeError):
+                return None
+        if star:
+            if not isinstance(value, list):
+                return None
+            if get_item is not None:
+                return tuple(get_item(v) for v in value)
+            return tuple(value)
+        return value
+
+    return get
+
+
+def _columns(columns):
+    """Column names and getters for a list of paths or a dict of name: path."""
+
+    if columns is None:
+        return {"id": _getter("id"), "record": json.dumps}
+    if not isinstance(columns, dict):
+        columns = {c: c for c in columns}
+
+    return {name: _getter(path) for name, path in columns.items()}
+
+
+def _scalar(value):
+
+    # lists from a "*" path are kept, other lists and objects are JSON
+    if isinstance(value, tuple):
+        return [_scalar(v) for v in value]
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def _is_null_list(field_type):
+
+    return pa.types.is_list(field_type) and pa.types.is_null(field_type.value_type)
+
+
+def _convert(value, field_type):
+
+    try:
+        return pa.array([value]).cast(field_type)[0].as_py()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return None
+
+
+def _array(values, field_type):
+    """Array of the type of the column in the first batch.
+
+    Values of another type are converted, e.g. 2021 to "2021" in a string
+    column or "2021" to 2021 in an integer column. Values that can't be
+    converted are null.
+    """
+
+    try:
+        return pa.array(values, type=field_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+
+    if pa.types.is_string(field_type):
+        values = [
+            v if v is None or isinstance(v, str) else json.dumps(v) for v in values
+        ]
+    else:
+        values = [None if v is None else _convert(v, field_type) for v in values]
+
+    return pa.array(values, type=field_type)
+
+
+def _record_batches(pages, columns, batch_size):
+    """Arrow record batches with at most batch_size rows from pages.
+
+    Columns are built directly from the records with one getter per column.
+    The first batch sets the column types, see _array for later batches.
+    """
+
+    getters = _columns(columns)
+    schema = None
+    rows = []
+
+    def to_batch():
+        nonlocal schema
+
+        arrays = {}
+        for name, get in getters.items():
+            values = [_scalar(get(r)) for r in rows]
+            if schema is None:
+                array = pa.array(values)
+            else:
+                array = _array(values, schema.field(name).type)
+
+            # columns without values in the first batch are strings
+            if schema is None and pa.types.is_null(array.type):
+                array = array.cast(pa.string())
+            elif schema is None and _is_null_list(array.type):
+                array = array.cast(pa.list_(pa.string()))
+            arrays[name] = array
+
+        batch = pa.RecordBatch.from_arrays(list(arrays.values()), list(arrays))
+        schema = batch.schema
+
+        return batch
+
+    for page in pages:
+        for record in page:
+            rows.append(record)
+
+            if len(rows) >= batch_size:
+                yield to_batch()
+                rows = []
+
+    if rows:
+        yield to_batch()
+
+
+def write_jsonl(pages, path):
+    """Write the records of pages to a JSON Lines file.
+
+    Each page is written and flushed as a whole, so the file holds complete
+    records of the pages written so far if the export is interrupted.
+
+    Returns:
+        int: Number of records written.
+    """
+
+    n = 0
+
+    with open(Path(path), "w", encoding="utf-8") as f:
+        for page in pages:
+            lines = [json.dumps(record) + "\n" for record in page]
+
+            f.write("".join(lines))
+            f.flush()
+
+            n = n + len(lines)
+
+    return n
+
+
+def write_parquet(pages, path, columns=None, row_group_size=10000):
+    """Write the records of pages to a Parquet file.
+
+    Records are collected in row groups of row_group_size and each row group
+    is written when it is full, so memory use is bounded by the row group.
+    If the export fails, the file is closed with the row groups written so
+    far.
+
+    Args:
+        pages (iterable): Pages of records, e.g. a Paginator.
+        path (str or Path): Path of the Parquet file.
+        columns (list or dict, optional): Dotted paths of the fields to write,
+            e.g. ``["id", "attributes.publicationYear"]``, or a dict of column
+            names and paths. Lists and dicts are written as JSON strings.
+            Defaults to the id and the full record as JSON.
+        row_group_size (int, optional): Number of records per row group.
+            Defaults to 10000.
+
+    Returns:
+        int: Number of records written.
+    """
+
+    _require_pyarrow()
+
+    writer = None
+    n = 0
+
+    try:
+        for batch in _record_batches(pages, columns, row_group_size):
+            if writer is None:
+                writer = pq.ParquetWriter(str(path), batch.schema)
+
+            writer.write_batch(batch)
+            n = n + batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return n
+
+
+def write_arrow_ipc(pages, path, columns=None, batch_size=10000):
+    """Write the records of pages to a file in the Arrow IPC streaming format.
+
+    The streaming format has no footer, so an interrupted export leaves a
+    file that can be read up to the last complete record batch with
+    ``pyarrow.ipc.open_stream``. See write_parquet for the arguments.
+
+    Returns:
+        int: Number of records written.
+    """
+
+    _require_pyarrow()
+
+    writer = None
+    n = 0
+
+    with pa.OSFile(str(path), "wb") as sink:
+        try:
+            for batch in _record_batches(pages, columns, batch_size):
+                if writer is None:
+                    writer = pa.ipc.new_stream(sink, batch.schema)
+
+                writer.write_batch(batch)
+                sink.flush()
+                n = n + batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+
+    return n
+
+
+def to_arrow(pages, columns=None, categorical=None, batch_size=10000):
+    """Return the records of pages as an Arrow table.
+
+    Records are flattened into columns in batches of batch_size records.
+
+    Args:
+        pages (iterable): Pages of records, e.g. a Paginator.
+        columns (list or dict, optional): Dotted paths of the fields, or a
+            dict of column names and paths, see write_parquet.
+        categorical (list, optional): Columns to dictionary encode, e.g.
+            low-cardinality fields like the state or the resource type.
+
+    Returns:
+        pyarrow.Table: Table with the columns.
+    """
+
+    _require_pyarrow()
+
+    batches = list(_record_batches(pages, columns, batch_size))
+    if batches:
+        table = pa.Table.from_batches(batches)
+    else:
+        table = pa.table(
+            {name: pa.array([], pa.string()) for name in _columns(columns)}
+        )
+
+    for name in categorical or []:
+        i = table.schema.get_field_index(name)
+        table = table.set_column(
+            i, name, table.column(name).cast(pa.string()).dictionary_encode()
+        )
+
+    return table
+
+
+def to_pandas(pages, columns=None, categorical=None):
+    """Return the records of pages as a pandas DataFrame.
+
+    Uses pyarrow if it is installed. Categorical columns have the pandas
+    category dtype. See to_arrow for the arguments.
+    """
+
+    if pd is None:
+        raise ImportError(
+            "Converting to pandas requires pandas. Install it with "
+            "'pip install pytacite[pandas]'."
+        )
+
+    if pa is not None:
+        return to_arrow(pages, columns, categorical).to_pandas()
+
+    getters = _columns(columns)
+    data = {name: [] for name in getters}
+
+    for page in pages:
+        page = list(page)
+        for name, get in getters.items():
+            data[name].extend([_scalar(get(r)) for r in page])
+
+    df = pd.DataFrame(data)
+    for name in categorical or []:
+        df[name] = df[name].astype("category")
+
+    return df
@@ -0,0 +1,391 @@
+import json
+import mmap
+import re
+import sys
+from array import array
+from pathlib import Path
+
+from pytacite.base import _iter_records
+
+_DOI_PREFIX = re.compile(r"^(https?://(dx\.)?doi\.org/|doi:)", re.IGNORECASE)
+_CAMEL_CASE = re.compile(r"(?<!^)(?=[A-Z])")
+
+# node ids and offsets in the arrays
+_ID = "i"
+_OFFSET = "q"
+
+
+def _normalize_doi(value):
+    """Lowercase DOI without resolver prefix, or None if value isn't a DOI."""
+
+    if not value:
+        return None
+
+    doi = _DOI_PREFIX.sub("", value.strip()).lower()
+
+    return doi if doi.startswith("10.") else None
+
+
+def _normalize_relation(relation):
+    """Relation type in kebab case, e.g. IsCitedBy -> is-cited-by."""
+
+    if "-" in relation:
+        return relation.lower()
+
+    return _CAMEL_CASE.sub("-", relation).lower()
+
+
+def _csr(n, src, dst):
+    """Compressed sparse rows of the edges, with sorted and unique rows."""
+
+    counts = array(_OFFSET, [0]) * (n + 1)
+    for s in src:
+        counts[s + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+
+    pos = array(_OFFSET, counts)
+    indices = array(_ID, [0]) * len(src)
+    for s, d in zip(src, dst):
+        indices[pos[s]] = d
+        pos[s] += 1
+
+    # remove duplicate edges, e.g. events from multiple sources
+    indptr = array(_OFFSET, [0])
+    unique = array(_ID)
+    for i in range(n):
+        unique.extend(sorted(set(indices[counts[i] : counts[i + 1]])))
+        indptr.append(len(unique))
+
+    return indptr, unique
+
+
+class GraphBuilder:
+    """Build a CitationGraph from Events and related identifiers.
+
+    Records are processed one at a time and only the DOIs and edges are
+    kept: DOIs are interned to integer ids and edges are stored in typed
+    arrays per relation type.
+
+    Example:
+
+        builder = GraphBuilder()
+        builder.add_events(Events().filter(prefix="10.5438"))
+        builder.add_related_identifiers(DOIs().filter(prefix="10.5438"))
+
+        graph = builder.build()
+        graph.save("graph")
+    """
+
+    def __init__(self):
+
+        self._ids = {}
+        self._dois = []
+        self._edges = {}
+
+    def _intern(self, doi):
+
+        i = self._ids.get(doi)
+        if i is None:
+            i = self._ids[doi] = len(self._dois)
+            self._dois.append(doi)
+
+        return i
+
+    def add_edge(self, source, target, relation):
+        """Add an edge between two DOIs. Returns False if one isn't a DOI."""
+
+        source = _normalize_doi(source)
+        target = _normalize_doi(target)
+        if source is None or target is None or not relation:
+            return False
+
+        relation = _normalize_relation(relation)
+        if relation not in self._edges:
+            self._edges[relation] = (array(_ID), array(_ID))
+
+        src, dst = self._edges[relation]
+        src.append(self._intern(source))
+        dst.append(self._intern(target))
+
+        return True
+
+    def add_events(self, events):
+        """Add the DOI to DOI edges of Events.
+
+        Args:
+            events: An Events query, a paginator, pages or Event records.
+
+        Returns:
+            int: Number of edges added.
+        """
+
+        n = 0
+        for event in _iter_records(events):
+            attributes = event.get("attributes", {})
+            n += self.add_edge(
+                attributes.get("subj-id"),
+                attributes.get("obj-id"),
+                attributes.get("relation-type-id"),
+            )
+
+        return n
+
+    def add_related_identifiers(self, dois):
+        """Add the edges to related DOIs in the relatedIdentifiers of DOIs.
+
+        Args:
+            dois: A DOIs query, a paginator, pages or DOI records.
+
+        Returns:
+            int: Number of edges added.
+        """
+
+        n = 0
+        for record in _iter_records(dois):
+            related = record.get("attributes", {}).get("relatedIdentifiers") or []
+
+            for r in related:
+                if r.get("relatedIdentifierType") == "DOI":
+                    n += self.add_edge(
+                        record["id"], r.get("relatedIdentifier"), r.get("relationType")
+                    )
+
+        return n
+
+    def build(self):
+        """Return the graph. Nodes are numbered in the order of their DOI."""
+
+        encoded = [doi.encode() for doi in self._dois]
+        order = sorted(range(len(encoded)), key=encoded.__getitem__)
+
+        remap = array(_ID, [0]) * len(order)
+        for new, old in enumerate(order):
+            remap[old] = new
+
+        names = b"".join(encoded[i] for i in order)
+        offsets = array(_OFFSET, [0])
+        for i in order:
+            offsets.append(offsets[-1] + len(encoded[i]))
+
+        n = len(order)
+        relations = {}
+        for relation, (src, dst) in sorted(self._edges.items()):
+            src = array(_ID, [remap[s] for s in src])
+            dst = array(_ID, [remap[d] for d in dst])
+
+            relations[relation] = _csr(n, src, dst) + _csr(n, dst, src)
+
+        return CitationGraph(names, offsets, relations)
+
+
+class CitationGraph:
+    """Directed graph of DOIs with compressed sparse row adjacency arrays.
+
+    Each relation type has the outgoing and the incoming edges of all nodes.
+    DOIs are looked up with a binary search in the sorted DOIs, so a graph
+    loaded from memory-mapped files holds no Python objects per node or
+    edge. Create a graph with GraphBuilder or CitationGraph.load.
+
+    Example:
+
+        graph = CitationGraph.load("graph")
+
+        graph.successors("10.5438/0012", "references")
+        graph.in_degree("10.5438/0012")
+    """
+
+    def __init__(self, names, offsets, relations, files=None):
+
+        self._names = names
+        self._offsets = offsets
+        self._relations = relations
+        self._files = files or []
+
+    def __len__(self):
+
+        return len(self._offsets) - 1
+
+    def __contains__(self, doi):
+
+        try:
+            self.index(doi)
+        except KeyError:
+            return False
+        return True
+
+    @property
+    def relations(self):
+
+        return list(self._relations)
+
+    @property
+    def n_edges(self):
+
+        return sum(len(r[1]) for r in self._relations.values())
+
+    def _key(self, i):
+
+        return self._names[self._offsets[i] : self._offsets[i + 1]]
+
+    def node(self, i):
+        """DOI of the node with id i."""
+
+        return self._key(i).decode()
+
+    def index(self, doi):
+        """Id of the node of the DOI. Raises a KeyError if it isn't in the graph."""
+
+        key = (_normalize_doi(doi) or "").encode()
+
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo == len(self) or self._key(lo) != key:
+            raise KeyError(doi)
+
+        return lo
+
+    def _arrays(self, relation, direction):
+
+        if relation is None:
+            relations = self._relations.values()
+        elif relation in self._relations:
+            relations = [self._relations[relation]]
+        else:
+            relations = []
+
+        return [r[direction : direction + 2] for r in relations]
+
+    def _neighbors(self, doi, relation, direction):
+
+        i = self.index(doi)
+
+        ids = []
+        for indptr, indices in self._arrays(relation, direction):
+            ids.extend(indices[indptr[i] : indptr[i + 1]])
+
+        return [self.node(j) for j in ids]
+
+    def _degree(self, doi, relation, direction):
+
+        i = self.index(doi)
+
+        return sum(
+            indptr[i + 1] - indptr[i] for indptr, _ in self._arrays(relation, direction)
+        )
+
+    def successors(self, doi, relation=None):
+        """DOIs of the outgoing edges of a DOI, for a relation or all."""
+
+        return self._neighbors(doi, relation, 0)
+
+    def predecessors(self, doi, relation=None):
+        """DOIs of the incoming edges of a DOI, for a relation or all."""
+
+        return self._neighbors(doi, relation, 2)
+
+    def out_degree(self, doi, relation=None):
+
+        return self._degree(doi, relation, 0)
+
+    def in_degree(self, doi, relation=None):
+
+        return self._degree(doi, relation, 2)
+
+    def save(self, path):
+        """Save the graph to the directory path.
+
+        The arrays are written as raw binary files that CitationGraph.load
+        can memory-map.
+        """
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        def write(name, values):
+            with open(path / name, "wb") as f:
+                f.write(memoryview(values).cast("B"))
+
+        write("nodes.bin", self._names)
+        write("nodes.offsets", self._offsets)
+
+        for i, arrays in enumerate(self._relations.values()):
+            for name, values in zip(["out-ptr", "out", "in-ptr", "in"], arrays):
+                write(f"relation-{i}.{name}", values)
+
+        with open(path / "meta.json", "w") as f:
+            json.dump(
+                {
+                    "version": 1,
+                    "byteorder": sys.byteorder,
+                    "nodes": len(self),
+                    "relations": self.relations,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path, memory_map=True):
+        """Load a graph saved with save.
+
+        Args:
+            path (str or Path): Directory of the graph.
+            memory_map (bool, optional): Memory-map the files instead of
+                reading them into memory. Defaults to True.
+        """
+
+        path = Path(path)
+
+        with open(path / "meta.json") as f:
+            meta = json.load(f)
+
+        if meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"The graph in {path} was saved with another byte order.")
+
+        files = []
+
+        def read(name, typecode=None):
+            with open(path / name, "rb") as f:
+                if memory_map and (path / name).stat().st_size > 0:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    files.append(data)
+                else:
+                    data = f.read()
+
+            if typecode is None:
+                return data
+
+            view = memoryview(data).cast(typecode)
+            files.append(view)
+            return view
+
+        relations = {}
+        for i, relation in enumerate(meta["relations"]):
+            relations[relation] = (
+                read(f"relation-{i}.out-ptr", _OFFSET),
+                read(f"relation-{i}.out", _ID),
+                read(f"relation-{i}.in-ptr", _OFFSET),
+                read(f"relation-{i}.in", _ID),
+            )
+
+        return cls(read("nodes.bin"), read("nodes.offsets", _OFFSET), relations, files)
+
+    def close(self):
+        """Close the memory-mapped files."""
+
+        self._names = self._offsets = None
+        self._relations = {}
+
+        # release the memoryviews before the files they point to
+        for f in reversed(self._files):
+            if isinstance(f, memoryview):
+                f.release()
+            else:
+                f.close()
+        self._files = []
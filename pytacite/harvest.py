@@ -0,0 +1,214 @@
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from pytacite.base import _id_key
+
+Shard = namedtuple("Shard", ["start", "end", "total"])
+
+# date fields that don't change, so a record stays in its shard
+_IMMUTABLE_FIELDS = {"created"}
+
+
+def _to_datetime(d):
+
+    if not isinstance(d, datetime):
+        d = datetime.fromisoformat(str(d))
+
+    if d.tzinfo is not None:
+        d = d.astimezone(timezone.utc)
+
+    return d.replace(tzinfo=None, microsecond=0)
+
+
+def _date_range(start, end):
+    """Half-open date range [start, end) in the DataCite query syntax.
+
+    None is an open bound.
+    """
+
+    start = "*" if start is None else start.strftime('"%Y-%m-%dT%H:%M:%SZ"')
+    end = "*" if end is None else end.strftime('"%Y-%m-%dT%H:%M:%SZ"')
+
+    return f"[{start} TO {end}}}"
+
+
+def _with_date_range(query, field, start, end):
+
+    q = query._copy(share_stats=True)
+    date_range = _date_range(start, end)
+
+    existing = q.params.get("query") if q.params else None
+    if existing is not None and not isinstance(existing, dict):
+        q._add_params("query", f"({existing}) AND {field}:{date_range}")
+    else:
+        q._add_params("query", {field: date_range})
+
+    return q
+
+
+class Harvester:
+    """Harvest all records of a query with parallel cursor paging.
+
+    A single DataCite cursor is sequential. The harvester splits the query
+    into disjoint shards on a date field, bisecting each shard with more than
+    ``max_shard_size`` records, and pages through the shards concurrently.
+    The records of all shards are returned as one iterator.
+
+    Split on a field that doesn't change, like the default "created", so
+    every record is in exactly one shard. With a field that changes during
+    the harvest, like "updated", a record can move to another shard: it is
+    returned once if that shard is still to be paged (seen ids are kept as
+    8-byte digests), but missed if the shard was already paged.
+
+    Args:
+        query (BaseDataCite): Query to harvest, e.g. ``DOIs().filter(...)``.
+        field (str, optional): Date field to split on. Defaults to "created".
+        start (str or datetime, optional): Start of the date range to split.
+            Records before the start are harvested as one shard. Defaults to
+            "2010-01-01".
+        end (str or datetime, optional): End of the date range to split. Records
+            after the end are harvested as one shard. Defaults to now.
+        max_shard_size (int, optional): Shards with more records are bisected.
+            Defaults to 100000.
+        max_workers (int, optional): Number of shards to harvest concurrently.
+            Defaults to 4.
+        per_page (int, optional): Entries per page. Defaults to 1000.
+
+    Example:
+
+        for record in Harvester(DOIs().filter(prefix="10.5438"), max_workers=8):
+            print(record["id"])
+    """
+
+    def __init__(
+        self,
+        query,
+        field="created",
+        start="2010-01-01",
+        end=None,
+        max_shard_size=100000,
+        max_workers=4,
+        per_page=1000,
+    ):
+
+        self.query = query
+        self.field = field
+        self.start = _to_datetime(start)
+        self.end = _to_datetime(end if end else datetime.now(timezone.utc))
+        self.max_shard_size = max_shard_size
+        self.max_workers = max_workers
+        self.per_page = per_page
+
+    def _shard_query(self, start, end):
+
+        return _with_date_range(self.query, self.field, start, end)
+
+    def _is_splittable(self, start, end, total):
+
+        return (
+            total > self.max_shard_size
+            and start is not None
+            and end is not None
+            and end - start > timedelta(seconds=1)
+        )
+
+    def shards(self):
+        """Split the query into shards of at most max_shard_size records.
+
+        Shards can only be bisected down to a second. Empty shards are dropped.
+
+        Returns:
+            list: Shard tuples (start, end, total), ordered by start.
+        """
+
+        pending = [(None, self.start), (self.start, self.end), (self.end, None)]
+        shards = []
+
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            while pending:
+                totals = executor.map(lambda s: self._shard_query(*s).count(), pending)
+
+                split = []
+                for (start, end), total in zip(pending, totals):
+                    if total == 0:
+                        continue
+
+                    if self._is_splittable(start, end, total):
+                        mid = (start + (end - start) / 2).replace(microsecond=0)
+                        split.extend([(start, mid), (mid, end)])
+                    else:
+                        shards.append(Shard(start, end, total))
+
+                pending = split
+
+        return sorted(shards, key=lambda s: s.start or datetime.min)
+
+    def _harvest_shard(self, shard, buffer, stop):
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            if stop.is_set():
+                return
+
+            pager = self._shard_query(shard.start, shard.end).paginate(
+                per_page=self.per_page, n_max=None
+            )
+            for page in pager:
+                if not put((page, None)):
+                    return
+        except Exception as err:
+            put((None, err))
+        else:
+            put((None, None))
+
+    def __iter__(self):
+
+        shards = self.shards()
+
+        buffer = queue.Queue(maxsize=self.max_workers * 2)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(self.max_workers)
+
+        for shard in shards:
+            executor.submit(self._harvest_shard, shard, buffer, stop)
+
+        # shards on a field that changes can return a record twice
+        seen = None if self.field in _IMMUTABLE_FIELDS else set()
+        n_done = 0
+
+        try:
+            while n_done < len(shards):
+                page, err = buffer.get()
+
+                if err is not None:
+                    raise err
+
+                if page is None:
+                    n_done += 1
+                    continue
+
+                if seen is None:
+                    yield from page
+                    continue
+
+                for record in page:
+                    key = _id_key(record["id"])
+                    if key not in seen:
+                        seen.add(key)
+                        yield record
+        finally:
+            stop.set()
+            executor.shutdown(wait=False)
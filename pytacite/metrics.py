@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import Counter
+from collections import namedtuple
+
+RequestEvent = namedtuple(
+    "RequestEvent",
+    [
+        "url",
+        "collection",
+        "status_code",
+        "connect",
+        "transfer",
+        "decode",
+        "bytes",
+        "retries",
+        "records",
+        "cache_hit",
+        "coalesced",
+    ],
+    defaults=[False],
+)
+RequestEvent.__doc__ = """Metrics of a single request.
+
+Times are in seconds. ``connect`` is the time until the response headers
+arrived (connection, request and server time), ``transfer`` the time to read
+the body and ``decode`` the time to decode the JSON. Retried attempts and
+waits are not included. ``bytes`` is the size of the body as received, so
+compressed responses count their compressed size. Cache hits only have a
+decode time. For streamed pages, decoding is interleaved with the transfer
+and decode is None. Coalesced requests waited for an identical request in
+flight and only have a decode time.
+"""
+
+
+class Stats:
+    """Aggregated metrics of the requests of a collection or paginator.
+
+    Every collection and paginator has a ``stats`` attribute. Stats are also
+    callables, so they can be added to ``pytacite.config.hooks`` to aggregate
+    the requests of all collections.
+
+    Example:
+
+        pager = DOIs().filter(prefix="10.5438").paginate(per_page=1000)
+        for page in pager:
+            pass
+
+        print(pager.stats)
+    """
+
+    def __init__(self):
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+
+        with self._lock:
+            self.requests = 0
+            self.cache_hits = 0
+            self.coalesced = 0
+            self.retries = 0
+            self.bytes = 0
+            self.records = 0
+            self.status_codes = Counter()
+            self.connect = 0.0
+            self.transfer = 0.0
+            self.decode = 0.0
+
+            self._start = None
+            self._end = None
+
+    def __call__(self, event):
+
+        now = time.monotonic()
+        duration = event.connect + event.transfer + (event.decode or 0.0)
+
+        with self._lock:
+            self.requests += 1
+            self.cache_hits += event.cache_hit
+            self.coalesced += event.coalesced
+            self.retries += event.retries
+            self.bytes += event.bytes
+            self.records += event.records
+            if event.status_code is not None:
+                self.status_codes[event.status_code] += 1
+
+            self.connect += event.connect
+            self.transfer += event.transfer
+            self.decode += event.decode or 0.0
+
+            if self._start is None:
+                self._start = now - duration
+            self._end = now
+
+    @property
+    def elapsed(self):
+        """Wall time from the start of the first to the end of the last request."""
+
+        if self._start is None:
+            return 0.0
+
+        return self._end - self._start
+
+    @property
+    def records_per_second(self):
+
+        if not self.elapsed:
+            return 0.0
+
+        return self.records / self.elapsed
+
+    def as_dict(self):
+
+        return {
+            "requests": self.requests,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "records": self.records,
+            "status_codes": dict(self.status_codes),
+            "connect": self.connect,
+            "transfer": self.transfer,
+            "decode": self.decode,
+            "records_per_second": self.records_per_second,
+        }
+
+    def __repr__(self):
+
+        return (
+            f"<Stats requests={self.requests} cache_hits={self.cache_hits} "
+            f"coalesced={self.coalesced} "
+            f"retries={self.retries} bytes={self.bytes} records={self.records} "
+            f"connect={self.connect:.3f}s transfer={self.transfer:.3f}s "
+            f"decode={self.decode:.3f}s "
+            f"records_per_second={self.records_per_second:.1f}>"
+        )
+
+
+def _n_records(res_json):
+
+    data = res_json.get("data")
+
+    return 1 if isinstance(data, dict) else len(data or [])
+
+
+class _Counted:
+    """Iterator over the chunks of a streamed response that records the bytes
+    read and the time spent reading them."""
+
+    def __init__(self, chunks):
+
+        self._chunks = iter(chunks)
+        self.bytes = 0
+        self.transfer = 0.0
+
+    def __iter__(self):
+
+        return self
+
+    def __next__(self):
+
+        start = time.perf_counter()
+        try:
+            chunk = next(self._chunks)
+        finally:
+            self.transfer += time.perf_counter() - start
+
+        self.bytes += len(chunk)
+
+        return chunk
@@ -0,0 +1,261 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from pytacite.base import _iter_records
+from pytacite.base import _pipe_method
+from pytacite.base import _resource_types
+
+# filter names and the indexed columns they map to
+_COLUMNS = {
+    "id": "id",
+    "doi": "id",
+    "prefix": "prefix",
+    "client_id": "client_id",
+    "publication_year": "publication_year",
+    "publicationyear": "publication_year",
+}
+
+
+def _column(name):
+
+    key = name.replace("-", "_").lower()
+    if key not in _COLUMNS:
+        raise ValueError(
+            f"The mirror can't filter on '{name}'. Indexed fields are: id, "
+            "prefix, client_id and publication_year."
+        )
+
+    return _COLUMNS[key]
+
+
+def _row(record):
+
+    attributes = record.get("attributes") or {}
+    relationships = record.get("relationships") or {}
+
+    record_id = record["id"].lower()
+
+    prefix = attributes.get("prefix")
+    if prefix is None and record.get("type") == "dois":
+        prefix = record_id.split("/", 1)[0]
+
+    client = (relationships.get("client") or {}).get("data")
+    client_id = client.get("id") if isinstance(client, dict) else None
+
+    return (
+        record_id,
+        record.get("type"),
+        prefix,
+        client_id,
+        attributes.get("publicationYear"),
+        json.dumps(record),
+    )
+
+
+class MirrorQuery:
+    """Query on the records of one collection in a Mirror.
+
+    Supports the filter and query pipe methods for the indexed fields.
+    """
+
+    def __init__(self, mirror, collection, params=None):
+
+        self.mirror = mirror
+        self.collection = collection
+        self.params = params or {}
+
+    def _copy(self):
+
+        return self.__class__(self.mirror, self.collection, dict(self.params))
+
+    @_pipe_method
+    def filter(self, **kwargs):
+
+        for argument, value in kwargs.items():
+            self.params[_column(argument)] = value
+
+    @_pipe_method
+    def query(self, **kwargs):
+
+        for argument, value in kwargs.items():
+            self.params[_column(argument)] = value
+
+    def _where(self):
+
+        clauses = ["type = ?"]
+        values = [self.collection]
+
+        for column, value in self.params.items():
+            # ids are stored lowercased
+            if column == "id":
+                value = (
+                    [v.lower() for v in value]
+                    if isinstance(value, (list, tuple))
+                    else value.lower()
+                )
+
+            if isinstance(value, (list, tuple)):
+                clauses.append(f"{column} IN ({','.join('?' * len(value))})")
+                values.extend(value)
+            else:
+                clauses.append(f"{column} = ?")
+                values.append(value)
+
+        return " AND ".join(clauses), values
+
+    def get(self, limit=None):
+        """Return the matching records, ordered by id."""
+
+        where, values = self._where()
+        sql = f"SELECT record FROM records WHERE {where} ORDER BY id"
+        if limit is not None:
+            sql = sql + f" LIMIT {int(limit)}"
+
+        return [
+            self.mirror._resource(record)
+            for (record,) in self.mirror._execute(sql, values)
+        ]
+
+    def count(self):
+
+        where, values = self._where()
+
+        return self.mirror._execute(
+            f"SELECT COUNT(*) FROM records WHERE {where}", values
+        )[0][0]
+
+
+class Mirror:
+    """Local copy of DataCite records in a SQLite database.
+
+    Records of any collection can be upserted into the mirror. Records are
+    indexed by id, prefix, client id and publication year, and can be looked
+    up and queried without touching the network.
+
+    Args:
+        path (str or Path): Location of the SQLite database.
+
+    Example:
+
+        mirror = Mirror("datacite.sqlite")
+        mirror.upsert(DOIs().filter(prefix="10.5438"))
+
+        mirror["10.5438/0012"]
+        mirror.collection(DOIs).filter(publicationYear=2016).count()
+    """
+
+    def __init__(self, path):
+
+        self.path = Path(path).expanduser()
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "id TEXT PRIMARY KEY, type TEXT, prefix TEXT, client_id TEXT, "
+            "publication_year INTEGER, record TEXT)"
+        )
+        for column in ("prefix", "client_id", "publication_year"):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS records_{column} "
+                f"ON records (type, {column})"
+            )
+        self._conn.commit()
+
+    def _execute(self, sql, values=()):
+
+        with self._lock:
+            return self._conn.execute(sql, values).fetchall()
+
+    def _resource(self, record):
+
+        ent = json.loads(record)
+
+        return _resource_types.get(ent.get("type"), dict)(ent)
+
+    def upsert(self, records, batch_size=1000):
+        """Insert or update records.
+
+        Args:
+            records: A collection query (e.g. ``DOIs().filter(...)``), whose
+                records are fetched with cursor paging, a Paginator or another
+                iterable of pages, or an iterable of records.
+            batch_size (int, optional): Number of records per transaction.
+                Defaults to 1000.
+
+        Returns:
+            int: Number of records upserted.
+        """
+
+        n = 0
+        rows = []
+
+        def flush():
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+
+        for record in _iter_records(records):
+            rows.append(_row(record))
+
+            if len(rows) >= batch_size:
+                flush()
+                n = n + len(rows)
+                rows = []
+
+        if rows:
+            flush()
+            n = n + len(rows)
+
+        return n
+
+    def __getitem__(self, record_id):
+
+        rows = self._execute(
+            "SELECT record FROM records WHERE id = ?", (record_id.lower(),)
+        )
+        if not rows:
+            raise KeyError(record_id)
+
+        return self._resource(rows[0][0])
+
+    def __contains__(self, record_id):
+
+        return bool(
+            self._execute("SELECT 1 FROM records WHERE id = ?", (record_id.lower(),))
+        )
+
+    def __len__(self):
+
+        return self._execute("SELECT COUNT(*) FROM records")[0][0]
+
+    def get(self, record_id, default=None):
+
+        try:
+            return self[record_id]
+        except KeyError:
+            return default
+
+    def collection(self, collection):
+        """Query the records of a collection.
+
+        Args:
+            collection: Collection class (e.g. DOIs) or name (e.g. "dois").
+
+        Returns:
+            MirrorQuery: Query with filter and query pipe methods.
+        """
+
+        if not isinstance(collection, str):
+            collection = collection()._collection_name()
+
+        return MirrorQuery(self, collection)
+
+    def close(self):
+
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,92 @@
+import random
+import threading
+import time
+from datetime import datetime
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+
+def backoff(attempt, factor, maximum):
+    """Exponential backoff with jitter for the given retry attempt."""
+
+    delay = min(maximum, factor * 2**attempt)
+
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def retry_after(res):
+    """Number of seconds in the Retry-After header of a response, or None."""
+
+    value = res.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Token bucket rate limiter that adapts to throttling by the server.
+
+    The limiter starts at ``rate`` requests per second. Each throttled
+    request (HTTP 429) halves the rate, down to ``min_rate``, and each
+    successful request increases it again by a twentieth of ``rate``. Shared
+    by all threads and async tasks, so concurrent workers stay close to the
+    rate the server accepts. Enable it with
+
+        pytacite.config.rate_limiter = RateLimiter(rate=10)
+
+    Args:
+        rate (float): Maximum number of requests per second.
+        burst (int, optional): Number of requests that can be made at once
+            after an idle period. Defaults to 1.
+        min_rate (float, optional): Minimum number of requests per second.
+            Defaults to 0.1.
+    """
+
+    def __init__(self, rate, burst=1, min_rate=0.1):
+
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token and return the number of seconds to wait for it."""
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+
+            self._tokens = self._tokens - 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def throttle(self):
+        """Decrease the rate after the server throttled a request."""
+
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def success(self):
+        """Increase the rate after a successful request."""
+
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
@@ -0,0 +1,236 @@
+import asyncio
+import random
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from datetime import datetime
+from datetime import timezone
+
+from pytacite.base import Results
+from pytacite.base import _id_key
+
+# DataCite returns at most 1000 random records per request
+_MAX_PER_PAGE = 1000
+
+
+class Sample(Results):
+    """Random sample of records returned by DOIs.sample.
+
+    The ``params`` attribute holds the sampling parameters and counts, e.g.
+    the URL and fingerprint of the query, the seed, the number of requests
+    and the number of duplicate records, so the sample can be audited. Pass
+    the sample as ``exclude`` to draw more records that aren't in it.
+    """
+
+    def __init__(self, records=(), collection=None, params=None):
+
+        super().__init__(records, collection)
+        self.params = params or {}
+
+    @property
+    def ids(self):
+
+        return [record["id"] for record in self]
+
+
+class _Sampler:
+    """Unique records of random pages until there are n of them."""
+
+    def __init__(self, query, n, seed, per_page, exclude, max_requests):
+
+        if n < 0:
+            raise ValueError("n should be zero or a positive number.")
+        if per_page < 1 or per_page > _MAX_PER_PAGE:
+            raise ValueError(
+                f"per_page should be a number between 1 and {_MAX_PER_PAGE}."
+            )
+
+        stats = query.stats
+        query = query.random()
+        query._add_params("page[size]", per_page)
+        query.stats = stats
+
+        self.query = query
+        self.url = query.url
+        self.n = n
+        self.seed = seed
+        self.per_page = per_page
+        self.max_requests = max_requests or 10 * -(-n // per_page) + 10
+
+        self.seen = set()
+        for record in exclude or []:
+            self.seen.add(_id_key(record if isinstance(record, str) else record["id"]))
+        self.excluded = len(self.seen)
+
+        self.records = []
+        self.requests = 0
+        self.submitted = 0
+        self.duplicates = 0
+        self.exhausted = False
+
+    def to_submit(self, in_flight, max_workers):
+        """Number of requests to start, without requesting more than needed."""
+
+        if self.exhausted:
+            return 0
+
+        needed = -(-(self.n - len(self.records)) // self.per_page)
+
+        return max(
+            0,
+            min(
+                needed - in_flight,
+                max_workers - in_flight,
+                self.max_requests - self.submitted,
+            ),
+        )
+
+    def add(self, res_json):
+
+        self.requests += 1
+
+        records = list(self.query._resources(res_json))
+        if not records:
+            self.exhausted = True
+
+        for record in records:
+            key = _id_key(record["id"])
+            if key in self.seen:
+                self.duplicates += 1
+            else:
+                self.seen.add(key)
+                self.records.append(record)
+
+    def done(self):
+
+        return len(self.records) >= self.n or self.exhausted
+
+    def result(self):
+
+        # the server can't be seeded, the seed selects and orders the records
+        rng = random.Random(self.seed)
+        records = self.records
+        if len(records) > self.n:
+            records = rng.sample(records, self.n)
+        else:
+            rng.shuffle(records)
+
+        return Sample(
+            records,
+            self.query,
+            {
+                "n": self.n,
+                "seed": self.seed,
+                "per_page": self.per_page,
+                "url": self.url,
+                "fingerprint": self.query.fingerprint,
+                "requests": self.requests,
+                "duplicates": self.duplicates,
+                "excluded": self.excluded,
+                "created": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+
+
+def sample(
+    query,
+    n,
+    seed=None,
+    per_page=_MAX_PER_PAGE,
+    max_workers=4,
+    exclude=None,
+    max_requests=None,
+):
+    """Draw a random sample of n unique records of a query.
+
+    Pages of random records are requested concurrently and records are
+    deduplicated by id until there are n unique records. Random requests are
+    never cached or coalesced. DataCite can't seed its random pages, so the
+    seed only makes the selection and the order of the returned records
+    reproducible for the same responses. Store the ids of the sample to
+    reproduce it.
+
+    Args:
+        query (DOIs): Query to sample from, e.g. ``DOIs().filter(...)``.
+        n (int): Number of records.
+        seed (int, optional): Seed of the selection and order of the records.
+        per_page (int, optional): Records per request, at most 1000.
+            Defaults to 1000.
+        max_workers (int, optional): Number of concurrent requests. Defaults
+            to 4.
+        exclude (iterable, optional): Ids or records, e.g. a previous sample,
+            that are left out of the sample.
+        max_requests (int, optional): Maximum number of requests. The sample
+            has fewer than n records if the query has too few records.
+            Defaults to ten times the number of pages needed.
+
+    Returns:
+        Sample: List of the records.
+    """
+
+    sampler = _Sampler(query, n, seed, per_page, exclude, max_requests)
+    query = sampler.query
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        pending = set()
+
+        try:
+            while not sampler.done():
+                for _ in range(sampler.to_submit(len(pending), max_workers)):
+                    pending.add(
+                        executor.submit(query._get_raw, sampler.url, query.stats)
+                    )
+                    sampler.submitted += 1
+
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sampler.add(future.result())
+        finally:
+            for future in pending:
+                future.cancel()
+
+    return sampler.result()
+
+
+async def async_sample(
+    query,
+    n,
+    seed=None,
+    per_page=_MAX_PER_PAGE,
+    max_workers=4,
+    exclude=None,
+    max_requests=None,
+):
+    """Draw a random sample of n unique records of an async query.
+
+    See sample.
+    """
+
+    sampler = _Sampler(query, n, seed, per_page, exclude, max_requests)
+    query = sampler.query
+    pending = set()
+
+    try:
+        while not sampler.done():
+            for _ in range(sampler.to_submit(len(pending), max_workers)):
+                pending.add(
+                    asyncio.ensure_future(query._get_raw(sampler.url, query.stats))
+                )
+                sampler.submitted += 1
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                sampler.add(task.result())
+    finally:
+        for task in pending:
+            task.cancel()
+
+    return sampler.result()
@@ -0,0 +1,165 @@
+import codecs
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+class _Reader:
+    """Read JSON values one at a time from a stream of bytes."""
+
+    def __init__(self, chunks):
+
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._eof = False
+
+        self.buf = ""
+        self.pos = 0
+
+    def _fill(self):
+
+        if self._eof:
+            raise ValueError("Unexpected end of the JSON document")
+
+        # drop the consumed part and at least double the unconsumed part, so
+        # values spanning many chunks are decoded in amortized linear time
+        self.buf = self.buf[self.pos :]
+        self.pos = 0
+        target = max(2 * len(self.buf), 1)
+
+        while len(self.buf) < target:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self._eof = True
+                self.buf += self._utf8.decode(b"", final=True)
+                return
+            self.buf += self._utf8.decode(chunk)
+
+    def peek(self):
+
+        while True:
+            self.pos = _whitespace.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            self._fill()
+
+    def expect(self, chars):
+
+        c = self.peek()
+        if c not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON document, got {c!r}")
+        self.pos += 1
+
+        return c
+
+    def value(self):
+
+        self.peek()
+
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                self._fill()
+                continue
+
+            # a number at the end of the buffer might continue in the next chunk
+            if end == len(self.buf) and isinstance(obj, (int, float)):
+                try:
+                    self._fill()
+                    continue
+                except ValueError:
+                    pass
+
+            self.pos = end
+            return obj
+
+
+def _iter_document(chunks, document):
+    """Yield the entries of the top-level "data" array of a JSON document.
+
+    The other top-level members (e.g. "meta" and "links") are stored in
+    document.
+    """
+
+    reader = _Reader(chunks)
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(":")
+
+        if key == "data" and reader.peek() == "[":
+            reader.expect("[")
+
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            document[key] = reader.value()
+
+        if reader.expect(",}") == "}":
+            return
+
+
+class StreamedPage:
+    """Page of records that is parsed while iterating over it.
+
+    Only one record at a time is decoded, so memory use doesn't grow with
+    the page size. The members "meta" and "links" are available once the
+    page has been iterated or closed.
+    """
+
+    def __init__(self, chunks, resource, close=None):
+
+        self.resource = resource
+        self.document = {}
+        self.n = 0
+
+        self._records = _iter_document(chunks, self.document)
+        self._close = close
+
+    def __iter__(self):
+
+        for ent in self._records:
+            self.n = self.n + 1
+            yield self.resource(ent)
+
+        self.close()
+
+    def close(self):
+        """Parse the remainder of the page and close the response."""
+
+        for _ in self._records:
+            self.n = self.n + 1
+
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    def abort(self):
+        """Close the response without parsing the rest of the page."""
+
+        self._records.close()
+
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+    @property
+    def meta(self):
+        return self.document.get("meta")
+
+    @property
+    def links(self):
+        return self.document.get("links", {})
@@ -0,0 +1,128 @@
+import json
+import os
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from pytacite.harvest import _to_datetime
+from pytacite.harvest import _with_date_range
+
+# date field to query and date attribute of the records, per collection
+_DATE_FIELDS = {
+    "dois": ("updated", "updated"),
+    "events": ("timestamp", "timestamp"),
+}
+
+
+def _parse_date(value):
+
+    return _to_datetime(str(value).replace("Z", "+00:00"))
+
+
+class IncrementalSync:
+    """Fetch the records of a query that changed since the previous run.
+
+    The state file holds a high-water mark: the time the last successful run
+    started. Each run fetches the records with the date field in the range
+    [watermark - overlap, now), so records that were indexed late are not
+    missed. Records from the overlap that were already returned by the
+    previous run (same id and date) are skipped. The watermark is moved
+    forward only when all records have been iterated, so a failed or
+    interrupted run is repeated the next time. The first run returns all
+    records.
+
+    Args:
+        query (BaseDataCite): Query to sync, e.g. ``DOIs().filter(...)``.
+        state (str or Path): Path of the JSON state file.
+        field (str, optional): Date field to query on. Defaults to "updated"
+            for DOIs and "timestamp" for Events.
+        attribute (str, optional): Attribute of the records with the date.
+            Defaults to the attribute of the default field, or field.
+        overlap (timedelta, optional): Safety overlap with the previous run.
+            Defaults to 1 hour.
+        per_page (int, optional): Entries per page. Defaults to 1000.
+
+    Example:
+
+        for record in IncrementalSync(DOIs().filter(prefix="10.5438"), "sync.json"):
+            print(record["id"])
+    """
+
+    def __init__(
+        self,
+        query,
+        state,
+        field=None,
+        attribute=None,
+        overlap=timedelta(hours=1),
+        per_page=1000,
+    ):
+
+        default_field, default_attribute = _DATE_FIELDS.get(
+            query._collection_name(), ("updated", "updated")
+        )
+
+        self.query = query
+        self.state = state
+        self.field = field or default_field
+        self.attribute = attribute or (default_attribute if field is None else field)
+        self.overlap = overlap
+        self.per_page = per_page
+
+    def _load(self):
+
+        if not os.path.exists(self.state):
+            return {"watermark": None, "seen": {}}
+
+        with open(self.state) as f:
+            return json.load(f)
+
+    def _save(self, state):
+
+        tmp_path = str(self.state) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state)
+
+    @property
+    def watermark(self):
+        """Start time of the last successful run, or None."""
+
+        watermark = self._load()["watermark"]
+
+        return None if watermark is None else _parse_date(watermark)
+
+    def __iter__(self):
+
+        state = self._load()
+        run_start = _to_datetime(datetime.now(timezone.utc))
+
+        start = None
+        if state["watermark"] is not None:
+            start = _parse_date(state["watermark"]) - self.overlap
+
+        query = _with_date_range(self.query, self.field, start, run_start)
+
+        # records in the overlap of the next run
+        boundary = run_start - self.overlap
+        seen = {}
+
+        for record in query.iter_records(per_page=self.per_page):
+            date = record.get("attributes", {}).get(self.attribute)
+
+            # without the date, records from the overlap can't be skipped
+            if date is None:
+                raise ValueError(
+                    f"Record {record['id']} has no attribute '{self.attribute}'. "
+                    "Pass the attribute with the date of the field."
+                )
+
+            # skipped records are kept too, the next run can overlap this one
+            if _parse_date(date) >= boundary:
+                seen[record["id"]] = date
+            if state["seen"].get(record["id"]) == date:
+                continue
+
+            yield record
+
+        self._save({"watermark": run_start.isoformat() + "Z", "seen": seen})
@@ -1,4 +1,11 @@
+import asyncio
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
@@ -7,13 +14,24 @@ from requests import HTTPError
 
 import pytacite
 from pytacite import DOI
+from pytacite import AsyncDOIs
+from pytacite import CitationGraph
+from pytacite import Client
 from pytacite import ClientPrefixes
 from pytacite import Clients
 from pytacite import DOIs
 from pytacite import Events
+from pytacite import Facet
+from pytacite import GraphBuilder
+from pytacite import Harvester
+from pytacite import IncrementalSync
+from pytacite import Mirror
 from pytacite import Prefixes
 from pytacite import ProviderPrefixes
 from pytacite import Providers
+from pytacite import RateLimiter
+from pytacite import ResponseCache
+from pytacite import count_many
 
 # from pytacite import Reports
 
@@ -51,6 +69,23 @@ def test_dois_count():
     assert DOIs().filter(prefix="10.5438").count() > 300
 
 
+def test_facets():
+
+    facets = DOIs().filter(prefix="10.5438").facets()
+
+    assert "resourceTypes" in facets
+    assert all(isinstance(f, Facet) for f in facets["resourceTypes"])
+    assert DOIs().facets("unknown") == {"unknown": []}
+
+
+def test_count_many():
+
+    q1 = DOIs().filter(prefix="10.5438")
+    q2 = DOIs().filter(prefix="10.14454")
+
+    assert count_many([q1, q2, q1]) == [q1.count(), q2.count(), q1.count()]
+
+
 def test_per_page():
 
     assert len(DOIs().filter(prefix="10.5438").get(per_page=200)) == 200
@@ -62,6 +97,47 @@ def test_10_14454_dois():
     assert DOIs()["10.14454/FXWS-0523"]["id"] == "10.14454/fxws-0523"
 
 
+def test_get_many_dois():
+
+    ids = ["10.14454/FXWS-0523", "NotAWorkID", "10.34894/HE6NAQ"]
+    r, missing = DOIs().get_many(ids, return_missing=True)
+
+    assert len(r) == 3
+    assert r[0]["id"] == "10.14454/fxws-0523"
+    assert r[1] is None
+    assert r[2]["id"] == "10.34894/he6naq"
+    assert missing == ["NotAWorkID"]
+
+
+def test_get_many_sici_doi():
+
+    # "#" in the DOI must not end the URL
+    sici = "10.1002/(SICI)1099-1050(199603)5:2<159::AID-HEC196>3.0.CO;2-#"
+    r, missing = DOIs().get_many(["10.14454/FXWS-0523", sici], return_missing=True)
+
+    assert r[0]["id"] == "10.14454/fxws-0523"
+    assert "%23" in DOIs()._batch_query([sici]).url
+
+
+def test_get_many_async():
+    async def main():
+        return await AsyncDOIs().get_many(
+            ["10.14454/FXWS-0523", "NotAWorkID"], return_missing=True
+        )
+
+    r, missing = asyncio.run(main())
+
+    assert r[0]["id"] == "10.14454/fxws-0523"
+    assert missing == ["NotAWorkID"]
+
+
+def test_get_many_clients():
+
+    r = Clients().get_many(["datacite.datacite", "cern.zenodo"])
+
+    assert [c["id"] for c in r] == ["datacite.datacite", "cern.zenodo"]
+
+
 def test_work_error():
 
     with pytest.raises(HTTPError):
@@ -85,6 +161,20 @@ def test_sample():
     assert len(r) == 4
 
 
+def test_sample_n():
+
+    s = DOIs().filter(prefix="10.5438").sample(50, seed=1, per_page=20)
+
+    assert len(s) == 50
+    assert len(set(s.ids)) == 50
+    assert s.params["seed"] == 1
+    assert s.params["requests"] >= 3
+
+    s2 = DOIs().filter(prefix="10.5438").sample(20, per_page=20, exclude=s)
+
+    assert not set(s.ids) & set(s2.ids)
+
+
 def test_query_single():
 
     r = requests.get("https://api.datacite.org/dois?query=climate%20change").json()
@@ -159,6 +249,75 @@ def test_dois_url():
     assert DOIs().url == "https://api.datacite.org/dois"
 
 
+def test_immutable_query():
+
+    query = DOIs().filter(prefix="10.5438")
+    sorted_query = query.sort("created")
+
+    assert query is not sorted_query
+    assert query.url == "https://api.datacite.org/dois?prefix=10.5438"
+
+    query.get(per_page=1)
+    query.paginate(per_page=1)
+    assert query.url == "https://api.datacite.org/dois?prefix=10.5438"
+
+
+def test_query_fingerprint():
+
+    q1 = DOIs().filter(prefix="10.5438").filter(client_id="datacite.datacite")
+    q2 = DOIs().filter(client_id="datacite.datacite").filter(prefix="10.5438")
+
+    assert q1.fingerprint == q2.fingerprint
+    assert q1 == q2
+    assert len({q1, q2}) == 1
+    assert q1 != Clients().filter(prefix="10.5438", client_id="datacite.datacite")
+    assert q1 != q1.select("doi")
+
+
+def test_select_url():
+
+    url = "https://api.datacite.org/dois?prefix=10.5438&fields[dois]=doi,titles"
+
+    assert url == DOIs().filter(prefix="10.5438").select("doi", "titles").url
+
+
+def test_select_dois():
+
+    r = DOIs().filter(prefix="10.5438").select("doi", "titles").get(per_page=10)
+
+    assert len(r) == 10
+    assert set(r[0]["attributes"].keys()) <= {"doi", "titles"}
+    assert "xml" not in r[0]["attributes"]
+
+
+def test_select_single_doi():
+
+    d = DOIs().select("doi")["10.14454/FXWS-0523"]
+
+    assert d["id"] == "10.14454/fxws-0523"
+    assert list(d["attributes"].keys()) == ["doi"]
+
+
+def test_include_url():
+
+    url = "https://api.datacite.org/dois?prefix=10.5438&include=client,provider"
+
+    assert url == DOIs().filter(prefix="10.5438").include("client", "provider").url
+
+
+def test_include_dois():
+
+    r = DOIs().filter(prefix="10.5438").include("client").get(per_page=10)
+
+    clients = [d["relationships"]["client"]["data"] for d in r]
+
+    assert isinstance(clients[0], Client)
+    assert "attributes" in clients[0]
+
+    # identity map: one object per client per page
+    assert all(c is clients[0] for c in clients if c["id"] == clients[0]["id"])
+
+
 def test_sort_dois():
 
     newest_first = (
@@ -221,6 +380,26 @@ def test_number_paging():
     assert n_paging == n
 
 
+def test_number_paging_parallel():
+
+    query = DOIs().filter(prefix="10.5438")
+
+    pages = [
+        [r["id"] for r in page]
+        for page in query.paginate(method="number", per_page=100)
+    ]
+    pages_parallel = [
+        [r["id"] for r in page]
+        for page in query.paginate(method="number", per_page=100, max_workers=4)
+    ]
+    pages_unordered = query.paginate(
+        method="number", per_page=100, max_workers=4, ordered=False
+    )
+
+    assert pages_parallel == pages
+    assert sum(len(page) for page in pages_unordered) == sum(map(len, pages))
+
+
 def test_cursor_paging():
 
     # get the number of records
@@ -250,6 +429,127 @@ def test_cursor_paging_n_max():
     assert n == 200
 
 
+def test_cursor_paging_prefetch():
+
+    # get the number of records
+    n = DOIs().filter(prefix="10.5438").count()
+
+    # example query
+    pager = DOIs().filter(prefix="10.5438").paginate(per_page=100, prefetch=2)
+
+    n_paging = 0
+    for page in pager:
+
+        n_paging += len(page)
+
+    assert n_paging == n
+
+
+def test_cursor_paging_prefetch_n_max():
+
+    pager = DOIs().filter(prefix="10.5438").paginate(per_page=50, n_max=200, prefetch=3)
+
+    n = 0
+    for page in pager:
+
+        n = n + len(page)
+
+    assert n == 200
+
+
+def test_cursor_paging_stream():
+
+    # get the number of records
+    n = DOIs().filter(prefix="10.5438").count()
+
+    # example query
+    pager = DOIs().filter(prefix="10.5438").paginate(per_page=100, stream=True)
+
+    ids = []
+    for page in pager:
+        for record in page:
+            assert isinstance(record, DOI)
+            ids.append(record["id"])
+
+    assert len(set(ids)) == n
+
+
+def test_cursor_paging_stream_close():
+
+    query = DOIs().filter(prefix="10.5438")
+
+    with query.paginate(per_page=100, stream=True) as pager:
+        page = next(pager)
+        next(iter(page))
+
+        # the request is recorded when the response is closed
+        assert pager.stats.requests == 0
+
+    assert pager.stats.requests == 1
+    assert page.n == 1
+
+
+def test_iter_records_n_max():
+
+    records = list(DOIs().filter(prefix="10.5438").iter_records(n_max=125, per_page=50))
+
+    assert len(records) == 125
+    assert len({r["id"] for r in records}) == 125
+    assert isinstance(records[0], DOI)
+
+
+def test_iter_records_all():
+
+    # get the number of records
+    n = DOIs().filter(prefix="10.5438").count()
+
+    records = DOIs().filter(prefix="10.5438").iter_records(per_page=200)
+
+    assert len({r["id"] for r in records}) == n
+
+
+def test_cursor_paging_resume(tmpdir):
+
+    checkpoint = Path(tmpdir, "state.json")
+
+    # stop after 3 pages
+    pager = (
+        DOIs()
+        .filter(prefix="10.5438")
+        .paginate(per_page=50, n_max=300, checkpoint=checkpoint)
+    )
+
+    ids = []
+    for i, page in enumerate(pager):
+        if i == 3:
+            break
+        ids.extend(r["id"] for r in page)
+
+    pager = (
+        DOIs()
+        .filter(prefix="10.5438")
+        .paginate(per_page=50, n_max=300, resume_from=checkpoint)
+    )
+
+    for page in pager:
+        ids.extend(r["id"] for r in page)
+
+    assert len(ids) == 300
+    assert len(set(ids)) == 300
+
+
+def test_cursor_paging_resume_other_query(tmpdir):
+
+    checkpoint = Path(tmpdir, "state.json")
+
+    pager = DOIs().filter(prefix="10.5438").paginate(per_page=50, checkpoint=checkpoint)
+    next(pager)
+    next(pager)
+
+    with pytest.raises(ValueError):
+        DOIs().filter(prefix="10.14454").paginate(per_page=50, resume_from=checkpoint)
+
+
 def test_cursor_paging_n_max_none():
 
     # get the number of records
@@ -266,6 +566,474 @@ def test_cursor_paging_n_max_none():
     assert n_paging == n
 
 
+def test_harvester():
+
+    # get the number of records
+    n = DOIs().filter(prefix="10.5438").count()
+
+    harvester = Harvester(
+        DOIs().filter(prefix="10.5438"), max_shard_size=100, per_page=100
+    )
+
+    assert sum(s.total for s in harvester.shards()) == n
+
+    ids = [r["id"] for r in harvester]
+
+    assert len(ids) == len(set(ids))
+    assert len(ids) == n
+
+
+def test_cache(tmpdir):
+
+    cache = ResponseCache(Path(tmpdir, "cache.sqlite"))
+    pytacite.config.cache = cache
+
+    try:
+        d1 = DOIs()["10.14454/FXWS-0523"]
+        d2 = DOIs()["10.14454/FXWS-0523"]
+        n1 = DOIs().filter(prefix="10.5438").count()
+        n2 = DOIs().filter(prefix="10.5438").count()
+    finally:
+        pytacite.config.cache = None
+
+    assert d1 == d2
+    assert n1 == n2
+    assert cache.stats["hits"] == 2
+    assert cache.stats["misses"] == 2
+
+
+def test_cache_ttl(tmpdir):
+
+    cache = ResponseCache(Path(tmpdir, "cache.sqlite"), ttls={"dois": 0})
+    pytacite.config.cache = cache
+
+    try:
+        DOIs()["10.14454/FXWS-0523"]
+        DOIs()["10.14454/FXWS-0523"]
+    finally:
+        pytacite.config.cache = None
+
+    assert cache.stats["hits"] == 0
+
+
+def test_rate_limiter():
+
+    limiter = RateLimiter(rate=10)
+
+    assert limiter.acquire() == 0
+    assert 0 < limiter.acquire() <= 0.1
+
+    limiter.throttle()
+    limiter.throttle()
+    assert limiter.rate == 2.5
+
+    limiter.success()
+    assert limiter.rate == 3
+
+
+def test_retry_after():
+
+    res = requests.Response()
+    res.headers["Retry-After"] = "3"
+
+    assert pytacite.retry.retry_after(res) == 3
+
+
+def test_retry_connection_reset():
+
+    calls = []
+
+    # the first response is cut off in the middle of the body
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            calls.append(self.path)
+
+            body = b'{"data": [], "meta": {"total": 42}}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.api+json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+
+            if len(calls) == 1:
+                self.wfile.write(body[:10])
+                self.wfile.flush()
+                self.close_connection = True
+            else:
+                self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    api_url = pytacite.config.api_url
+    pytacite.config.api_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        query = DOIs()
+        assert query.count() == 42
+    finally:
+        pytacite.config.api_url = api_url
+        server.shutdown()
+        server.server_close()
+
+    assert len(calls) == 2
+    assert query.stats.retries == 1
+
+
+def test_incremental_sync(tmpdir):
+
+    state = Path(tmpdir, "sync.json")
+    sync = IncrementalSync(DOIs().filter(prefix="10.5438"), state, per_page=200)
+
+    # first run returns all records
+    n = DOIs().filter(prefix="10.5438").count()
+    assert len(list(sync)) == n
+    assert sync.watermark is not None
+
+    # second run skips the records returned by the first run
+    assert len(list(sync)) == 0
+
+
+def test_incremental_sync_close_runs(tmpdir):
+
+    # runs closer together than the overlap, all records are in the overlap
+    state = Path(tmpdir, "sync.json")
+    sync = IncrementalSync(
+        DOIs().filter(prefix="10.5438"),
+        state,
+        overlap=timedelta(days=365 * 50),
+        per_page=200,
+    )
+
+    assert len(list(sync)) == DOIs().filter(prefix="10.5438").count()
+    assert len(list(sync)) == 0
+    assert len(list(sync)) == 0
+
+
+def test_incremental_sync_events(tmpdir):
+
+    query = Events().filter(doi="10.5438/0012")
+    sync = IncrementalSync(
+        query,
+        Path(tmpdir, "sync.json"),
+        overlap=timedelta(days=365 * 50),
+        per_page=200,
+    )
+
+    assert sync.field == "timestamp"
+
+    records = list(sync)
+    assert all("timestamp" in r["attributes"] for r in records)
+
+    # the overlap is deduplicated on the timestamp of the events
+    assert len(list(sync)) == 0
+
+
+def test_incremental_sync_interrupted(tmpdir):
+
+    state = Path(tmpdir, "sync.json")
+    sync = IncrementalSync(DOIs().filter(prefix="10.5438"), state, per_page=200)
+
+    for _ in sync:
+        break
+
+    assert sync.watermark is None
+
+
+def test_mirror(tmpdir):
+
+    mirror = Mirror(Path(tmpdir, "mirror.sqlite"))
+    n = mirror.upsert(DOIs().filter(prefix="10.5438"))
+
+    assert n == DOIs().filter(prefix="10.5438").count()
+    assert len(mirror) == n
+    assert mirror["10.5438/0012"]["id"] == "10.5438/0012"
+    assert mirror.get("10.5438/does-not-exist") is None
+    assert mirror.collection(DOIs).filter(prefix="10.5438").count() == n
+    assert mirror.collection(DOIs).filter(id="10.5438/0012").count() == 1
+    assert mirror.collection(DOIs).filter(doi=["10.5438/0012"]).count() == 1
+
+    with pytest.raises(ValueError):
+        mirror.collection(DOIs).filter(titles="x")
+
+
+def test_stats():
+
+    events = []
+    pytacite.config.hooks.append(events.append)
+
+    try:
+        pager = DOIs().filter(prefix="10.5438").paginate(per_page=100, n_max=200)
+        n = sum(len(page) for page in pager)
+    finally:
+        pytacite.config.hooks.remove(events.append)
+
+    assert pager.stats.requests == 2
+    assert pager.stats.records == n
+    assert pager.stats.status_codes[200] == 2
+    assert pager.stats.bytes > 0
+    assert len(events) == 2
+    assert events[0].collection == "dois"
+
+
+def test_stats_per_query():
+
+    base = DOIs().filter(prefix="10.5438")
+    a = base.filter(publicationYear=2020)
+    b = base.filter(publicationYear=2021)
+
+    a.count()
+    b.count()
+    b.get(per_page=1)
+
+    assert a.stats is not b.stats
+    assert a.stats.requests == 1
+    assert b.stats.requests == 2
+    assert base.stats.requests == 0
+
+
+def test_json_decoder():
+
+    pytacite.config.json_decoder = "json"
+    try:
+        assert DOIs()["10.14454/fxws-0523"]["id"] == "10.14454/fxws-0523"
+    finally:
+        pytacite.config.json_decoder = "auto"
+
+    with pytest.raises(ValueError):
+        pytacite.decode.get_decoder("unknown")
+
+
+def test_coalesce_requests():
+
+    received = []
+
+    # slow local server, so the requests overlap
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            received.append(self.path)
+            time.sleep(0.3)
+
+            body = b'{"data": [], "meta": {"total": 42}}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.api+json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    api_url = pytacite.config.api_url
+    pytacite.config.api_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        query = DOIs().filter(prefix="10.5438")
+        barrier = threading.Barrier(8)
+
+        def count(_):
+            barrier.wait()
+            return query.count()
+
+        with ThreadPoolExecutor(8) as executor:
+            counts = list(executor.map(count, range(8)))
+    finally:
+        pytacite.config.api_url = api_url
+        server.shutdown()
+        server.server_close()
+
+    assert counts == [42] * 8
+    assert query.stats.requests == 8
+    assert query.stats.coalesced == 7
+    assert len(received) == 1
+
+
+def test_citation_graph(tmpdir):
+
+    events = [
+        {
+            "attributes": {
+                "subj-id": "https://doi.org/10.5438/0012",
+                "obj-id": "https://doi.org/10.5438/0013",
+                "relation-type-id": "references",
+            }
+        },
+        {
+            "attributes": {
+                "subj-id": "https://doi.org/10.5438/0012",
+                "obj-id": "https://en.wikipedia.org/wiki/DataCite",
+                "relation-type-id": "references",
+            }
+        },
+    ]
+
+    builder = GraphBuilder()
+    assert builder.add_events(events) == 1
+    builder.add_related_identifiers(DOIs().filter(prefix="10.5438").get())
+    builder.build().save(Path(tmpdir, "graph"))
+
+    graph = CitationGraph.load(Path(tmpdir, "graph"))
+    assert "10.5438/0013" in graph.successors("10.5438/0012", "references")
+    assert graph.in_degree("10.5438/0013", "references") >= 1
+    assert "10.5438/unknown" not in graph
+    graph.close()
+
+
+def test_session_reuse():
+
+    session = pytacite.base.get_session()
+    DOIs().filter(prefix="10.5438").get(per_page=1)
+
+    assert pytacite.base.get_session() is session
+
+
+def test_session_context_manager():
+
+    session = pytacite.base.get_session()
+
+    with DOIs().filter(prefix="10.5438").paginate(per_page=1, n_max=2) as pager:
+        assert len(next(pager)) == 1
+
+    # leaving the block keeps the shared session for other paginators
+    assert pytacite.base.get_session() is session
+
+    pytacite.close_session()
+    assert pytacite.base._session is None
+
+
+def test_async_requires_httpx(monkeypatch):
+
+    monkeypatch.setattr(pytacite.base, "httpx", None)
+
+    with pytest.raises(ImportError, match="pytacite\\[async\\]"):
+        AsyncDOIs()
+
+
+def test_async_dois():
+    async def main():
+        d = await AsyncDOIs()["10.14454/FXWS-0523"]
+        n = await AsyncDOIs().filter(prefix="10.5438").count()
+        r = await AsyncDOIs().filter(prefix="10.5438").get(per_page=10)
+
+        await pytacite.close_async_session()
+
+        return d, n, r
+
+    d, n, r = asyncio.run(main())
+
+    assert isinstance(d, DOI)
+    assert d["id"] == "10.14454/fxws-0523"
+    assert n > 300
+    assert len(r) == 10
+
+
+def test_async_cursor_paging():
+    async def main():
+        pager = AsyncDOIs().filter(prefix="10.5438").paginate(per_page=50, n_max=200)
+
+        n = 0
+        async for page in pager:
+            n = n + len(page)
+
+        return n
+
+    assert asyncio.run(main()) == 200
+
+
+def test_async_url():
+
+    assert AsyncDOIs().filter(prefix="10.5438").url == (
+        DOIs().filter(prefix="10.5438").url
+    )
+
+
+def test_paginate_to_jsonl(tmpdir):
+
+    pager = DOIs().filter(prefix="10.5438").paginate(per_page=50, n_max=200)
+    n = pager.to_jsonl(Path(tmpdir, "dois.jsonl"))
+
+    with open(Path(tmpdir, "dois.jsonl")) as f:
+        records = [json.loads(line) for line in f]
+
+    assert n == 200
+    assert len(records) == 200
+    assert records[0]["id"].startswith("10.5438")
+
+
+def test_paginate_to_parquet(tmpdir):
+
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    pager = DOIs().filter(prefix="10.5438").paginate(per_page=50, n_max=200)
+    n = pager.to_parquet(
+        Path(tmpdir, "dois.parquet"),
+        columns={"id": "id", "year": "attributes.publicationYear"},
+        row_group_size=100,
+    )
+
+    table = pq.read_table(Path(tmpdir, "dois.parquet"))
+
+    assert n == 200
+    assert table.column_names == ["id", "year"]
+    assert table.num_rows == 200
+
+
+def test_to_arrow_types_across_batches():
+
+    pytest.importorskip("pyarrow")
+
+    columns = {"id": "id", "year": "attributes.publicationYear"}
+
+    # null in the first batch makes a string column
+    pages = [[{"id": "a"}], [{"id": "b", "attributes": {"publicationYear": 2021}}]]
+    table = pytacite.export.to_arrow(pages, columns, batch_size=1)
+
+    assert table.column("year").to_pylist() == [None, "2021"]
+
+    # strings in an integer column are converted, or null
+    pages = [
+        [{"id": "a", "attributes": {"publicationYear": 2020}}],
+        [{"id": "b", "attributes": {"publicationYear": "2021"}}],
+        [{"id": "c", "attributes": {"publicationYear": "unknown"}}],
+    ]
+    table = pytacite.export.to_arrow(pages, columns, batch_size=1)
+
+    assert table.column("year").to_pylist() == [2020, 2021, None]
+
+
+def test_paginate_to_pandas():
+
+    pytest.importorskip("pandas")
+
+    pager = DOIs().filter(prefix="10.5438").paginate(per_page=50, n_max=200)
+    df = pager.to_pandas()
+
+    assert len(df) == 200
+    assert list(df.columns) == list(DOIs.columns)
+    assert df["resourceTypeGeneral"].dtype == "category"
+    assert len(df["creators"][0]) >= 1
+
+
+def test_results_to_pandas():
+
+    pytest.importorskip("pandas")
+
+    df = (
+        DOIs()
+        .filter(prefix="10.5438")
+        .get(per_page=10)
+        .to_pandas(columns={"id": "id", "year": "attributes.publicationYear"})
+    )
+
+    assert list(df.columns) == ["id", "year"]
+    assert len(df) == 10
+
+
 def test_serializable(tmpdir):
 
     with open(Path(tmpdir, "test.json"), "w") as f: